@@ -9,6 +9,7 @@ class Settings(BaseSettings):
 
     # Database - default works for Docker, override with DB_PATH env var for local dev
     db_path: Path = Path("/app/data/sources.db")
+    db_pool_size: int = 4  # Read-only connections kept open for queries
 
     # API Settings
     api_host: str = "0.0.0.0"
@@ -18,6 +19,9 @@ class Settings(BaseSettings):
     # OpenRouter LLM API
     openrouter_api_key: str = ""
     default_analysis_model: str = "anthropic/claude-sonnet-4"
+    openrouter_requests_per_minute: int = 50  # Per-model pacing for analysis calls
+    openrouter_tokens_per_minute: int = 200_000
+    analysis_workers: int = 4  # Background analysis jobs run at the same time
 
     @property
     def cors_origins_list(self) -> list[str]:
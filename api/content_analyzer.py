@@ -1,69 +1,87 @@
 """Content analysis using OpenRouter LLM API."""
 
-import httpx
-import json
-from typing import Optional
-from dataclasses import dataclass, field
+import asyncio
+import orjson
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+from dataclasses import dataclass, field, asdict
+from . import llm_cache, semantic_cache
 from .config import settings
+from .rate_limit import (
+    MAX_ATTEMPTS,
+    RETRYABLE_STATUS,
+    backoff_delay,
+    openrouter_buckets,
+    retry_after_seconds,
+)
 from .usage_tracker import log_api_usage, calculate_cost, UsageLog
 
-OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+if TYPE_CHECKING:
+    import httpx
 
-# Analysis prompt template
-ANALYSIS_PROMPT = """You are an expert media analyst. Analyze the following news article for quality, bias, and reliability.
+OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
-ARTICLE CONTENT:
-{content}
+# Static analysis rubric, sent ahead of the article so it forms a cacheable
+# prompt prefix. It must stay byte-identical across calls for cache hits.
+STATIC_RUBRIC = """You are an expert media analyst. Analyze the news article that follows for quality, bias, and reliability.
 
 Provide a structured analysis in the following JSON format:
 
-{{
+{
   "summary": "2-3 sentence summary of what the article is about",
 
-  "inflammatory_language": {{
+  "inflammatory_language": {
     "score": <1-10, where 1=neutral/factual, 10=highly inflammatory>,
     "examples": ["list of specific inflammatory phrases found"],
     "explanation": "brief explanation of the inflammatory language used"
-  }},
+  },
 
-  "unsupported_claims": {{
+  "unsupported_claims": {
     "score": <1-10, where 1=well-sourced, 10=many unsupported claims>,
     "claims": [
-      {{
+      {
         "claim": "the specific claim made",
         "issue": "why it's unsupported (no source, vague attribution, etc.)"
-      }}
+      }
     ],
     "explanation": "overall assessment of sourcing quality"
-  }},
+  },
 
-  "emotional_manipulation": {{
+  "emotional_manipulation": {
     "score": <1-10, where 1=objective, 10=highly manipulative>,
     "techniques": ["list of manipulation techniques detected"],
     "explanation": "how the article attempts to influence reader emotions"
-  }},
+  },
 
-  "factual_reporting": {{
+  "factual_reporting": {
     "score": <1-10, where 1=opinion/speculation, 10=factual reporting>,
     "strengths": ["what the article does well factually"],
     "weaknesses": ["factual issues or gaps"]
-  }},
+  },
 
-  "bias_indicators": {{
+  "bias_indicators": {
     "detected_lean": "<Left|Lean Left|Center|Lean Right|Right|Unknown>",
     "indicators": ["specific phrases or framing that indicate bias"],
     "explanation": "assessment of political or ideological bias"
-  }},
+  },
 
-  "overall_quality": {{
+  "overall_quality": {
     "score": <1-100, overall quality/reliability score>,
     "grade": "<A|B|C|D|F>",
     "recommendation": "brief recommendation for readers"
-  }}
-}}
+  }
+}
 
 Return ONLY valid JSON, no additional text or markdown formatting."""
 
+# Message block for the rubric, built once; only the article block varies
+_RUBRIC_BLOCK = {
+    "type": "text",
+    "text": STATIC_RUBRIC,
+    "cache_control": {"type": "ephemeral"}
+}
+
+ARTICLE_HEADER = "ARTICLE CONTENT:\n"
+
 
 @dataclass
 class AnalysisScores:
@@ -111,12 +129,65 @@ class ContentAnalysis:
     model_used: Optional[str] = None
     error: Optional[str] = None
 
+    @classmethod
+    def from_dict(cls, data: dict, url: Optional[str] = None) -> "ContentAnalysis":
+        """Rebuild an analysis from its asdict() form, optionally for another URL."""
+        data = dict(data)
+        if data.get("scores"):
+            data["scores"] = AnalysisScores(**data["scores"])
+        if url is not None:
+            data["url"] = url
+        return cls(**data)
+
+
+async def _read_completion_stream(
+    response: "httpx.Response",
+    on_delta: Optional[Callable[[str], Awaitable[None]]] = None
+) -> tuple[str, dict]:
+    """
+    Accumulate an OpenRouter server-sent event stream.
+
+    Args:
+        response: Open streaming response
+        on_delta: Optional callback awaited with each content fragment
+
+    Returns:
+        Tuple of (full completion text, usage dict from the final chunk)
+    """
+    parts = []
+    usage_data = {}
+
+    async for line in response.aiter_lines():
+        # Skip keep-alive comments and blank separators
+        if not line.startswith("data: "):
+            continue
+        data = line[len("data: "):]
+        if data == "[DONE]":
+            break
+
+        chunk = orjson.loads(data)
+        if "error" in chunk:
+            raise RuntimeError(chunk["error"].get("message", "stream error"))
+        if chunk.get("usage"):
+            usage_data = chunk["usage"]
+
+        for choice in chunk.get("choices") or []:
+            delta = (choice.get("delta") or {}).get("content")
+            if delta:
+                parts.append(delta)
+                if on_delta:
+                    await on_delta(delta)
+
+    return "".join(parts), usage_data
+
 
 async def analyze_content(
     url: str,
     content: str,
+    client: "httpx.AsyncClient",
     model: str = "anthropic/claude-sonnet-4",
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    on_delta: Optional[Callable[[str], Awaitable[None]]] = None
 ) -> ContentAnalysis:
     """
     Analyze article content using OpenRouter LLM.
@@ -124,12 +195,16 @@ async def analyze_content(
     Args:
         url: The article URL (for reference)
         content: The article text to analyze
+        client: Shared HTTP client (connection pool owned by the app)
         model: OpenRouter model ID
         timeout: Request timeout in seconds
+        on_delta: Optional callback awaited with each streamed completion fragment
 
     Returns:
         ContentAnalysis with detailed findings
     """
+    import httpx  # Deferred so app startup does not pay for it
+
     if not settings.openrouter_api_key:
         return ContentAnalysis(
             url=url,
@@ -143,11 +218,52 @@ async def analyze_content(
     if len(content) > max_chars:
         truncated_content += "\n\n[Article truncated for analysis...]"
 
-    prompt = ANALYSIS_PROMPT.format(content=truncated_content)
+    # Identical content analyzed by the same model returns the stored result
+    key = llm_cache.cache_key(model, truncated_content)
+    cached = await llm_cache.get(key)
+    if cached:
+        return ContentAnalysis.from_dict(cached, url=url)
+
+    # Syndicated or lightly edited copies of an analyzed article reuse its result
+    similar, simhash = await semantic_cache.find_similar(model, truncated_content)
+    if similar:
+        return ContentAnalysis.from_dict(similar, url=url)
+
+    # Rubric first (cached upstream), then the variable article content
+    messages = [
+        {
+            "role": "user",
+            "content": [
+                _RUBRIC_BLOCK,
+                {"type": "text", "text": ARTICLE_HEADER + truncated_content}
+            ]
+        }
+    ]
+
+    request_body = {
+        "model": model,
+        "messages": messages,
+        "temperature": 0.0,  # Deterministic so cached results stay representative
+        "max_tokens": 2000,
+        "stream": True
+    }
+
+    # Pin Anthropic models to Anthropic's own endpoint, which honors cache_control
+    if model.startswith("anthropic/"):
+        request_body["provider"] = {"order": ["anthropic"]}
+
+    # Pace requests and tokens (~4 chars per token, plus the completion budget)
+    rpm_bucket, tpm_bucket = openrouter_buckets(model)
+    estimated_tokens = (len(STATIC_RUBRIC) + len(truncated_content)) // 4 + request_body["max_tokens"]
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        # Retry transient failures (429/5xx); nothing is streamed until a 200
+        for attempt in range(MAX_ATTEMPTS):
+            await rpm_bucket.acquire(1)
+            await tpm_bucket.acquire(estimated_tokens)
+
+            async with client.stream(
+                "POST",
                 OPENROUTER_API_URL,
                 headers={
                     "Authorization": f"Bearer {settings.openrouter_api_key}",
@@ -155,97 +271,100 @@ async def analyze_content(
                     "HTTP-Referer": "https://sourceinfo.app",
                     "X-Title": "SourceInfo Content Analyzer"
                 },
-                json={
-                    "model": model,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.3,  # Lower for more consistent analysis
-                    "max_tokens": 2000
-                },
+                json=request_body,
                 timeout=timeout
-            )
-
-            if response.status_code != 200:
-                return ContentAnalysis(
-                    url=url,
-                    success=False,
-                    error=f"OpenRouter API error: {response.status_code} - {response.text}"
-                )
-
-            result = response.json()
-
-            # Extract the response content
-            response_text = result["choices"][0]["message"]["content"]
-
-            # Extract token usage for cost tracking
-            usage_data = result.get("usage", {})
-            input_tokens = usage_data.get("prompt_tokens", 0)
-            output_tokens = usage_data.get("completion_tokens", 0)
-            cost = calculate_cost(model, input_tokens, output_tokens)
-
-            # Parse JSON response
-            try:
-                # Handle potential markdown code blocks
-                if "```json" in response_text:
-                    response_text = response_text.split("```json")[1].split("```")[0]
-                elif "```" in response_text:
-                    response_text = response_text.split("```")[1].split("```")[0]
-
-                analysis_data = json.loads(response_text.strip())
-            except json.JSONDecodeError as e:
-                return ContentAnalysis(
-                    url=url,
-                    success=False,
-                    error=f"Failed to parse LLM response as JSON: {str(e)}",
-                    model_used=model
-                )
-
-            # Build the ContentAnalysis object
-            analysis_result = ContentAnalysis(
+            ) as response:
+                if response.status_code == 200:
+                    # Accumulate the completion as SSE chunks arrive
+                    response_text, usage_data = await _read_completion_stream(response, on_delta)
+                    break
+
+                await response.aread()
+                retryable = response.status_code in RETRYABLE_STATUS
+                if not retryable or attempt == MAX_ATTEMPTS - 1:
+                    return ContentAnalysis(
+                        url=url,
+                        success=False,
+                        error=f"OpenRouter API error: {response.status_code} - {response.text}"
+                    )
+                retry_after = retry_after_seconds(response)
+
+            if response.status_code == 429 and retry_after:
+                # Let upstream's cooldown hold back every caller on this model;
+                # the next acquire() waits it out
+                rpm_bucket.pause(retry_after)
+                tpm_bucket.pause(retry_after)
+            else:
+                await asyncio.sleep(backoff_delay(attempt, retry_after))
+
+        # Extract token usage for cost tracking (sent with the final chunk)
+        input_tokens = usage_data.get("prompt_tokens", 0)
+        output_tokens = usage_data.get("completion_tokens", 0)
+        cost = calculate_cost(model, input_tokens, output_tokens)
+
+        # Parse JSON response
+        try:
+            # Handle potential markdown code blocks
+            if "```json" in response_text:
+                response_text = response_text.split("```json")[1].split("```")[0]
+            elif "```" in response_text:
+                response_text = response_text.split("```")[1].split("```")[0]
+
+            analysis_data = orjson.loads(response_text.strip())
+        except orjson.JSONDecodeError as e:
+            return ContentAnalysis(
                 url=url,
-                success=True,
-                summary=analysis_data.get("summary"),
-                scores=AnalysisScores(
-                    inflammatory_language=analysis_data.get("inflammatory_language", {}).get("score", 0),
-                    unsupported_claims=analysis_data.get("unsupported_claims", {}).get("score", 0),
-                    emotional_manipulation=analysis_data.get("emotional_manipulation", {}).get("score", 0),
-                    factual_reporting=analysis_data.get("factual_reporting", {}).get("score", 0),
-                    overall_quality=analysis_data.get("overall_quality", {}).get("score", 0),
-                    overall_grade=analysis_data.get("overall_quality", {}).get("grade", "?")
-                ),
-                inflammatory_examples=analysis_data.get("inflammatory_language", {}).get("examples", []),
-                inflammatory_explanation=analysis_data.get("inflammatory_language", {}).get("explanation"),
-                unsupported_claims=analysis_data.get("unsupported_claims", {}).get("claims", []),
-                claims_explanation=analysis_data.get("unsupported_claims", {}).get("explanation"),
-                manipulation_techniques=analysis_data.get("emotional_manipulation", {}).get("techniques", []),
-                manipulation_explanation=analysis_data.get("emotional_manipulation", {}).get("explanation"),
-                factual_strengths=analysis_data.get("factual_reporting", {}).get("strengths", []),
-                factual_weaknesses=analysis_data.get("factual_reporting", {}).get("weaknesses", []),
-                detected_bias=analysis_data.get("bias_indicators", {}).get("detected_lean"),
-                bias_indicators=analysis_data.get("bias_indicators", {}).get("indicators", []),
-                bias_explanation=analysis_data.get("bias_indicators", {}).get("explanation"),
-                recommendation=analysis_data.get("overall_quality", {}).get("recommendation"),
-                model_used=model,
-                error=None
+                success=False,
+                error=f"Failed to parse LLM response as JSON: {str(e)}",
+                model_used=model
             )
 
-            # Log successful API usage
-            log_api_usage(UsageLog(
-                api_name="openrouter",
-                endpoint="/chat/completions",
-                model_used=model,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                estimated_cost_usd=cost,
-                url=url,
-                success=True
-            ))
+        # Build the ContentAnalysis object
+        analysis_result = ContentAnalysis(
+            url=url,
+            success=True,
+            summary=analysis_data.get("summary"),
+            scores=AnalysisScores(
+                inflammatory_language=analysis_data.get("inflammatory_language", {}).get("score", 0),
+                unsupported_claims=analysis_data.get("unsupported_claims", {}).get("score", 0),
+                emotional_manipulation=analysis_data.get("emotional_manipulation", {}).get("score", 0),
+                factual_reporting=analysis_data.get("factual_reporting", {}).get("score", 0),
+                overall_quality=analysis_data.get("overall_quality", {}).get("score", 0),
+                overall_grade=analysis_data.get("overall_quality", {}).get("grade", "?")
+            ),
+            inflammatory_examples=analysis_data.get("inflammatory_language", {}).get("examples", []),
+            inflammatory_explanation=analysis_data.get("inflammatory_language", {}).get("explanation"),
+            unsupported_claims=analysis_data.get("unsupported_claims", {}).get("claims", []),
+            claims_explanation=analysis_data.get("unsupported_claims", {}).get("explanation"),
+            manipulation_techniques=analysis_data.get("emotional_manipulation", {}).get("techniques", []),
+            manipulation_explanation=analysis_data.get("emotional_manipulation", {}).get("explanation"),
+            factual_strengths=analysis_data.get("factual_reporting", {}).get("strengths", []),
+            factual_weaknesses=analysis_data.get("factual_reporting", {}).get("weaknesses", []),
+            detected_bias=analysis_data.get("bias_indicators", {}).get("detected_lean"),
+            bias_indicators=analysis_data.get("bias_indicators", {}).get("indicators", []),
+            bias_explanation=analysis_data.get("bias_indicators", {}).get("explanation"),
+            recommendation=analysis_data.get("overall_quality", {}).get("recommendation"),
+            model_used=model,
+            error=None
+        )
+
+        # Log successful API usage
+        log_api_usage(UsageLog(
+            api_name="openrouter",
+            endpoint="/chat/completions",
+            model_used=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            estimated_cost_usd=cost,
+            url=url,
+            success=True
+        ))
+
+        payload = asdict(analysis_result)
+        await llm_cache.set(key, payload)
+        await semantic_cache.add(model, simhash, payload)
 
-            return analysis_result
+        return analysis_result
 
     except httpx.TimeoutException:
         # Log failed API call
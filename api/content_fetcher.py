@@ -1,13 +1,20 @@
 """Article content fetching using Jina AI Reader API."""
 
-import httpx
-from typing import Optional
+import asyncio
+from typing import TYPE_CHECKING, Optional
 from dataclasses import dataclass
+from .rate_limit import MAX_ATTEMPTS, RETRYABLE_STATUS, backoff_delay, retry_after_seconds
 from .usage_tracker import log_api_usage, UsageLog
 
+if TYPE_CHECKING:
+    import httpx
+
 # Jina AI Reader API - converts URLs to clean markdown
 JINA_READER_URL = "https://r.jina.ai/"
 
+# Upper bound on article text kept in memory; analysis only uses the first 15k chars
+MAX_CONTENT_LENGTH = 200_000
+
 
 @dataclass
 class ArticleContent:
@@ -21,8 +28,21 @@ class ArticleContent:
     error: Optional[str] = None
 
 
+async def _read_limited(response: "httpx.Response", limit: int) -> bytes:
+    """Read at most `limit` bytes of a streamed body, leaving the rest unread."""
+    chunks = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return b"".join(chunks)[:limit]
+
+
 async def fetch_article_content(
     url: str,
+    client: "httpx.AsyncClient",
     timeout: float = 60.0
 ) -> ArticleContent:
     """
@@ -30,79 +50,101 @@ async def fetch_article_content(
 
     Args:
         url: The article URL to fetch
+        client: Shared HTTP client (connection pool owned by the app)
         timeout: Request timeout in seconds
 
     Returns:
         ArticleContent with extracted text or error
     """
+    import httpx  # Deferred so app startup does not pay for it
+
     try:
         jina_url = f"{JINA_READER_URL}{url}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                jina_url,
-                timeout=timeout,
-                headers={
-                    "Accept": "text/plain",
-                    # Jina returns markdown by default
-                }
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                async with client.stream(
+                    "GET",
+                    jina_url,
+                    timeout=timeout,
+                    headers={
+                        "Accept": "text/plain",
+                        # Jina returns markdown by default
+                    }
+                ) as response:
+                    status_code = response.status_code
+                    if status_code == 200:
+                        # Stop reading oversized pages instead of buffering them whole
+                        body = await _read_limited(response, MAX_CONTENT_LENGTH)
+                        encoding = response.encoding or "utf-8"
+                    retry_after = retry_after_seconds(response)
+            except httpx.TimeoutException:
+                # A timeout already cost a full `timeout`; retry it only once
+                if attempt > 0:
+                    raise
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+
+            if status_code not in RETRYABLE_STATUS or attempt == MAX_ATTEMPTS - 1:
+                break
+            await asyncio.sleep(backoff_delay(attempt, retry_after))
+
+        if status_code != 200:
+            return ArticleContent(
+                url=url,
+                title=None,
+                content="",
+                method="jina",
+                word_count=0,
+                success=False,
+                error=f"Jina AI returned status {status_code}"
             )
 
-            if response.status_code != 200:
-                return ArticleContent(
-                    url=url,
-                    title=None,
-                    content="",
-                    method="jina",
-                    word_count=0,
-                    success=False,
-                    error=f"Jina AI returned status {response.status_code}"
-                )
-
-            content = response.text
-
-            # Check if we got meaningful content
-            if len(content.strip()) < 200:
-                return ArticleContent(
-                    url=url,
-                    title=None,
-                    content=content,
-                    method="jina",
-                    word_count=len(content.split()),
-                    success=False,
-                    error="Content too short - may be paywalled or blocked"
-                )
-
-            # Try to extract title from first line (usually markdown heading)
-            lines = content.strip().split('\n')
-            title = None
-            if lines and lines[0].startswith('#'):
-                title = lines[0].lstrip('#').strip()
-
-            word_count = len(content.split())
-
-            # Log successful Jina API usage (free, $0 cost)
-            log_api_usage(UsageLog(
-                api_name="jina",
-                endpoint="/reader",
-                model_used=None,
-                input_tokens=0,
-                output_tokens=0,
-                estimated_cost_usd=0.0,
-                url=url,
-                success=True
-            ))
+        # A cut at the byte limit may split a character; replace it
+        content = body.decode(encoding, errors="replace")
 
+        # Check if we got meaningful content
+        if len(content.strip()) < 200:
             return ArticleContent(
                 url=url,
-                title=title,
+                title=None,
                 content=content,
                 method="jina",
-                word_count=word_count,
-                success=True,
-                error=None
+                word_count=len(content.split()),
+                success=False,
+                error="Content too short - may be paywalled or blocked"
             )
 
+        # Try to extract title from first line (usually markdown heading)
+        lines = content.strip().split('\n')
+        title = None
+        if lines and lines[0].startswith('#'):
+            title = lines[0].lstrip('#').strip()
+
+        word_count = len(content.split())
+
+        # Log successful Jina API usage (free, $0 cost)
+        log_api_usage(UsageLog(
+            api_name="jina",
+            endpoint="/reader",
+            model_used=None,
+            input_tokens=0,
+            output_tokens=0,
+            estimated_cost_usd=0.0,
+            url=url,
+            success=True
+        ))
+
+        return ArticleContent(
+            url=url,
+            title=title,
+            content=content,
+            method="jina",
+            word_count=word_count,
+            success=True,
+            error=None
+        )
+
     except httpx.TimeoutException:
         # Log failed Jina API call
         log_api_usage(UsageLog(
@@ -156,6 +198,7 @@ def create_manual_content(url: str, content: str, title: Optional[str] = None) -
     Use this when Jina fails and user provides content via Playwright MCP
     or copy/paste.
     """
+    content = content[:MAX_CONTENT_LENGTH]
     return ArticleContent(
         url=url,
         title=title,
@@ -1,103 +1,341 @@
 """Database operations for SourceInfo API."""
 
+import asyncio
+import functools
+import itertools
+import os
+import queue
 import sqlite3
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional, TypeVar
 from contextlib import contextmanager
 
+from cachetools import TTLCache
+
 from .config import settings
+from .internal_types import COUNTER_COLUMNS, CounterRow, SourceRow
+from .utils.url_parser import domain_candidates
+
+# Per-connection tuning: 64 MiB page cache, 256 MiB memory-mapped I/O
+CONNECTION_PRAGMAS = (
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Prepared statements kept per connection; query texts below are fixed so
+# every repeat call reuses an already compiled plan
+STATEMENT_CACHE_SIZE = 256
+
+_pool: Optional[queue.Queue] = None
+_pool_lock = threading.Lock()
+
+# Worker threads for DB calls from async routes, one per pooled connection,
+# so excess calls queue here instead of blocking threads on the pool
+_executor: Optional[ThreadPoolExecutor] = None
+
+T = TypeVar("T")
+
+# Source rows change only when the database is rebuilt; cache hits and misses
+SOURCE_CACHE_SIZE = 10_000
+SOURCE_CACHE_TTL = 600
+
+_source_cache: TTLCache[str, Optional[SourceRow]] = TTLCache(SOURCE_CACHE_SIZE, SOURCE_CACHE_TTL)
+_source_cache_lock = threading.Lock()
+
+# Aggregate stats change only on rebuild too; one entry, refreshed each minute
+STATS_CACHE_TTL = 60
+
+_stats_cache: TTLCache[str, dict] = TTLCache(1, STATS_CACHE_TTL)
+_stats_cache_lock = threading.Lock()
+
+
+def _enable_wal(db_path: Path) -> None:
+    """Switch the database to WAL journaling if we are allowed to write it."""
+    # The container mounts the database read-only; leave its journal mode alone
+    if not os.access(db_path, os.W_OK):
+        return
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.OperationalError:
+        pass
+    finally:
+        conn.close()
+
+
+def _open_connection(db_path: Path) -> sqlite3.Connection:
+    """Open a read-only connection shared across requests."""
+    conn = sqlite3.connect(
+        f"{db_path.resolve().as_uri()}?mode=ro",
+        uri=True,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _get_pool() -> queue.Queue:
+    """Lazily open the connection pool on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _enable_wal(settings.db_path)
+                pool = queue.Queue()
+                for _ in range(settings.db_pool_size):
+                    pool.put(_open_connection(settings.db_path))
+                _pool = pool
+    return _pool
+
+
+def close_db_connections() -> None:
+    """Close all pooled connections (called on application shutdown)."""
+    global _pool, _executor
+    with _pool_lock:
+        pool, _pool = _pool, None
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+    while pool is not None and not pool.empty():
+        pool.get_nowait().close()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _pool_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.db_pool_size,
+                    thread_name_prefix="sourceinfo-db"
+                )
+    return _executor
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking database function on the DB worker threads.
+
+    Args:
+        func: Function from this module
+        *args, **kwargs: Its arguments
+
+    Returns:
+        The function's result
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
 
 
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections."""
-    conn = sqlite3.connect(settings.db_path)
-    conn.row_factory = sqlite3.Row
+    """Context manager that borrows a pooled database connection."""
+    pool = _get_pool()
+    conn = pool.get()
     try:
         yield conn
     finally:
-        conn.close()
+        pool.put(conn)
+
 
+def _lookup_keys(domain: str) -> list[str]:
+    """Exact keys to try for a domain: the input as given, then host suffixes."""
+    keys = [domain.strip().lower()]
+    for candidate in domain_candidates(domain):
+        if candidate not in keys:
+            keys.append(candidate)
+    return keys
 
-def lookup_source(domain: str) -> Optional[dict]:
+
+def _find_source_row(cursor: sqlite3.Cursor, domain: str, columns: str) -> Optional[sqlite3.Row]:
+    """
+    Find the most specific stored source for a domain.
+
+    Uses exact matches on the primary-key index only (no wildcard scans).
+    """
+    keys = _lookup_keys(domain)
+    placeholders = ",".join("?" * len(keys))
+    cursor.execute(
+        f"SELECT {columns} FROM sources WHERE domain IN ({placeholders}) "
+        "ORDER BY length(domain) DESC LIMIT 1",
+        keys
+    )
+    return cursor.fetchone()
+
+
+def lookup_source(domain: str) -> Optional[SourceRow]:
     """
     Look up a source by domain.
 
+    Results (including misses) are cached for SOURCE_CACHE_TTL seconds, so
+    each row's criteria JSON is parsed once per TTL rather than per lookup.
+
     Args:
         domain: The domain to look up (e.g., "nytimes.com")
 
     Returns:
-        Dict with source info or None if not found
+        SourceRow or None if not found
     """
+    key = domain.strip().lower()
+    with _source_cache_lock:
+        if key in _source_cache:
+            return _source_cache[key]
+
     with get_db_connection() as conn:
         cursor = conn.cursor()
+        row = _find_source_row(cursor, domain, "*")
+        result = SourceRow.from_row(row) if row else None
 
-        # Try exact match first
-        cursor.execute("SELECT * FROM sources WHERE domain = ?", (domain,))
-        row = cursor.fetchone()
+    with _source_cache_lock:
+        _source_cache[key] = result
+    return result
 
-        # If not found, try fuzzy match
-        if not row:
-            cursor.execute(
-                "SELECT * FROM sources WHERE domain LIKE ? LIMIT 1",
-                (f"%{domain}%",)
-            )
-            row = cursor.fetchone()
-
-        if row:
-            result = dict(row)
-            # Parse JSON criteria if present
-            if result.get("criteria_json"):
-                try:
-                    result["criteria"] = json.loads(result["criteria_json"])
-                    del result["criteria_json"]
-                except (json.JSONDecodeError, TypeError):
-                    result["criteria"] = None
-            return result
-        return None
-
-
-def lookup_sources_bulk(domains: list[str]) -> dict[str, dict]:
+
+async def lookup_source_async(domain: str) -> Optional[SourceRow]:
+    """
+    Async lookup_source: cache hits are answered on the event loop.
+
+    Args:
+        domain: The domain to look up (e.g., "nytimes.com")
+
+    Returns:
+        SourceRow or None if not found
+    """
+    key = domain.strip().lower()
+    with _source_cache_lock:
+        if key in _source_cache:
+            return _source_cache[key]
+    return await run_db(lookup_source, domain)
+
+
+def lookup_sources_bulk(domains: list[str]) -> dict[str, SourceRow]:
     """
     Look up multiple sources by domain.
 
+    Only domains missing from the source cache are queried.
+
     Args:
         domains: List of domains to look up
 
     Returns:
-        Dict mapping domain to source info
+        Dict mapping domain to SourceRow
     """
     results = {}
+    uncached = []
+    with _source_cache_lock:
+        for domain in domains:
+            source = _source_cache.get(domain)
+            # Bulk lookups are exact; ignore misses and suffix matches
+            if source is not None and source.domain == domain:
+                results[domain] = source
+            else:
+                uncached.append(domain)
+
+    if not uncached:
+        return results
+
     with get_db_connection() as conn:
         cursor = conn.cursor()
 
         # Use parameterized query for bulk lookup
-        placeholders = ",".join("?" * len(domains))
+        placeholders = ",".join("?" * len(uncached))
         cursor.execute(
             f"SELECT * FROM sources WHERE domain IN ({placeholders})",
-            domains
+            uncached
         )
+        rows = cursor.fetchall()
 
-        for row in cursor.fetchall():
-            source = dict(row)
-            if source.get("criteria_json"):
-                try:
-                    source["criteria"] = json.loads(source["criteria_json"])
-                    del source["criteria_json"]
-                except (json.JSONDecodeError, TypeError):
-                    source["criteria"] = None
-            results[source["domain"]] = source
+    with _source_cache_lock:
+        for row in rows:
+            source = SourceRow.from_row(row)
+            results[source.domain] = source
+            _source_cache[source.domain] = source
+
+    return results
+
+
+def lookup_sources_by_host(hosts: list[str]) -> dict[str, Optional[SourceRow]]:
+    """
+    Look up the most specific stored source for each of several hosts.
+
+    Uses lookup_source's matching rule (longest matching key from the host
+    down to its registered domain) and shares its cache, but all uncached
+    hosts are resolved with a single query.
+
+    Args:
+        hosts: Hostnames (e.g., "abcnews.go.com")
+
+    Returns:
+        Dict mapping each host to its SourceRow, or None if not found
+    """
+    results = {}
+    keys_by_host = {}
+    with _source_cache_lock:
+        for host in hosts:
+            key = host.strip().lower()
+            if key in _source_cache:
+                results[host] = _source_cache[key]
+            else:
+                keys_by_host[host] = _lookup_keys(host)
+
+    if not keys_by_host:
+        return results
+
+    all_keys = list(dict.fromkeys(key for keys in keys_by_host.values() for key in keys))
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT * FROM sources WHERE domain IN ({','.join('?' * len(all_keys))})",
+            all_keys
+        )
+        found = {row["domain"]: SourceRow.from_row(row) for row in cursor.fetchall()}
+
+    with _source_cache_lock:
+        for host, keys in keys_by_host.items():
+            match = max((key for key in keys if key in found), key=len, default=None)
+            source = found[match] if match else None
+            results[host] = source
+            _source_cache[host.strip().lower()] = source
 
     return results
 
 
+def _counternarrative_side_sql(preferred_leans: Optional[list[int]]) -> tuple[str, list]:
+    """
+    Build the condition selecting counters `s` for a source lean `src.lean`.
+
+    Returns:
+        Tuple of (SQL fragment, its parameters)
+    """
+    if preferred_leans:
+        # Explicit targets; for non-center sources they must still be opposite.
+        # Canonical order keeps the SQL text (and its cached statement) stable.
+        leans = sorted(set(preferred_leans))
+        side_sql = (
+            f"s.political_lean IN ({','.join('?' * len(leans))}) "
+            "AND (src.lean = 0 OR s.political_lean * src.lean < 0)"
+        )
+        return side_sql, leans
+
+    # Center sources get both sides; others get the opposite side
+    side_sql = (
+        "CASE WHEN src.lean = 0 THEN s.political_lean != 0 "
+        "ELSE s.political_lean * src.lean < 0 END"
+    )
+    return side_sql, []
+
+
 def find_counternarratives(
     domain: str,
     min_credibility: int = 60,
     limit: int = 10,
     preferred_leans: Optional[list[int]] = None
-) -> list[dict]:
+) -> list[CounterRow]:
     """
     Find sources from the opposite political spectrum.
 
@@ -110,71 +348,134 @@ def find_counternarratives(
     Returns:
         List of counternarrative sources
     """
+    keys = _lookup_keys(domain)
+    side_sql, side_params = _counternarrative_side_sql(preferred_leans)
+    params = [*keys, *side_params, min_credibility, limit]
+
     with get_db_connection() as conn:
         cursor = conn.cursor()
 
-        # First get the source's political lean
-        cursor.execute(
-            "SELECT political_lean FROM sources WHERE domain = ? OR domain LIKE ?",
-            (domain, f"%{domain}%")
-        )
-        row = cursor.fetchone()
+        # Resolve the source's lean and select its counters in one statement
+        cursor.execute(f"""
+            WITH src AS (
+                SELECT political_lean AS lean
+                FROM sources
+                WHERE domain IN ({",".join("?" * len(keys))})
+                ORDER BY length(domain) DESC
+                LIMIT 1
+            )
+            SELECT {COUNTER_COLUMNS}
+            FROM src, sources s
+            WHERE src.lean IS NOT NULL
+              AND s.political_lean IS NOT NULL
+              AND {side_sql}
+              AND s.newsguard_score >= ?
+            ORDER BY s.newsguard_score DESC, s.domain
+            LIMIT ?
+        """, params)
 
-        if not row or row["political_lean"] is None:
-            return []
-
-        source_lean = row["political_lean"]
-
-        if source_lean == 0:
-            # Center sources - return both left and right
-            if preferred_leans:
-                placeholders = ",".join("?" * len(preferred_leans))
-                cursor.execute(f"""
-                    SELECT domain, name, newsguard_score, political_lean, political_lean_label,
-                           source_type, description
-                    FROM sources
-                    WHERE political_lean IN ({placeholders})
-                      AND newsguard_score >= ?
-                    ORDER BY newsguard_score DESC
-                    LIMIT ?
-                """, (*preferred_leans, min_credibility, limit))
-            else:
-                cursor.execute("""
-                    SELECT domain, name, newsguard_score, political_lean, political_lean_label,
-                           source_type, description
-                    FROM sources
-                    WHERE political_lean != 0
-                      AND newsguard_score >= ?
-                    ORDER BY newsguard_score DESC
-                    LIMIT ?
-                """, (min_credibility, limit))
-        else:
-            # Find opposite side
-            if preferred_leans:
-                placeholders = ",".join("?" * len(preferred_leans))
-                cursor.execute(f"""
-                    SELECT domain, name, newsguard_score, political_lean, political_lean_label,
-                           source_type, description
-                    FROM sources
-                    WHERE political_lean IN ({placeholders})
-                      AND political_lean * ? < 0
-                      AND newsguard_score >= ?
-                    ORDER BY newsguard_score DESC
-                    LIMIT ?
-                """, (*preferred_leans, source_lean, min_credibility, limit))
-            else:
-                cursor.execute("""
-                    SELECT domain, name, newsguard_score, political_lean, political_lean_label,
-                           source_type, description
-                    FROM sources
-                    WHERE political_lean IS NOT NULL
-                      AND political_lean * ? < 0
-                      AND newsguard_score >= ?
-                    ORDER BY newsguard_score DESC
-                    LIMIT ?
-                """, (source_lean, min_credibility, limit))
+        return [CounterRow(*row) for row in cursor.fetchall()]
+
+
+def find_counternarratives_bulk(
+    source_leans: dict[str, int],
+    min_credibility: int = 60,
+    limit: int = 10,
+    preferred_leans: Optional[list[int]] = None
+) -> dict[str, list[CounterRow]]:
+    """
+    Find counternarratives for several sources in a single query.
+
+    Counters depend only on a source's lean, so each distinct lean is
+    queried once and its top `limit` counters are shared by its sources.
+
+    Args:
+        source_leans: Mapping of source domain to its political lean
+        min_credibility: Minimum NewsGuard score (default 60)
+        limit: Maximum number of results per source
+        preferred_leans: Specific lean values to target (e.g., [1, 2] for right-leaning)
+
+    Returns:
+        Dict mapping each source domain to its counternarrative sources
+    """
+    leans = sorted(set(source_leans.values()))
+    if not leans:
+        return {}
+
+    side_sql, side_params = _counternarrative_side_sql(preferred_leans)
+    params = [*leans, *side_params, min_credibility, limit]
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        # Rank counters within each source lean and keep the top `limit`
+        cursor.execute(f"""
+            WITH src(lean) AS (VALUES {",".join(["(?)"] * len(leans))})
+            SELECT * FROM (
+                SELECT {COUNTER_COLUMNS},
+                       src.lean AS source_lean,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY src.lean ORDER BY s.newsguard_score DESC, s.domain
+                       ) AS rank
+                FROM src, sources s
+                WHERE s.political_lean IS NOT NULL
+                  AND {side_sql}
+                  AND s.newsguard_score >= ?
+            )
+            WHERE rank <= ?
+            ORDER BY source_lean, rank
+        """, params)
 
-        return [dict(row) for row in cursor.fetchall()]
+        by_lean: dict[int, list[CounterRow]] = {lean: [] for lean in leans}
+        for row in cursor.fetchall():
+            by_lean[row["source_lean"]].append(CounterRow(*row[:-2]))
+
+    return {domain: list(by_lean[lean]) for domain, lean in source_leans.items()}
+
+
+def _build_query_sources_sql(lean: bool, credibility: bool, source_type: bool) -> tuple[str, str]:
+    """Build the (count, page) SQL for one combination of query_sources filters."""
+    where_clauses = []
+    if lean:
+        where_clauses.append("political_lean = ?")
+    if credibility:
+        where_clauses.append("newsguard_score >= ?")
+    if source_type:
+        where_clauses.append("source_type = ?")
+    where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+
+    count_sql = f"SELECT COUNT(*) FROM sources WHERE {where_sql}"
+    page_sql = f"""
+        SELECT domain, name, newsguard_score, political_lean, political_lean_label,
+               source_type, description
+        FROM sources
+        WHERE {where_sql}
+        ORDER BY newsguard_score DESC, name ASC, domain
+        LIMIT ? OFFSET ?
+    """
+    return count_sql, page_sql
+
+
+# All 2^3 filter combinations, keyed by (lean, min_credibility, source_type) presence
+_QUERY_SOURCES_SQL = {
+    flags: _build_query_sources_sql(*flags)
+    for flags in itertools.product((False, True), repeat=3)
+}
+
+
+def _query_sources_sql(
+    lean: Optional[int],
+    min_credibility: Optional[int],
+    source_type: Optional[str]
+) -> tuple[str, str, list]:
+    """Pick the prebuilt (count, page) SQL for the given filters, plus its parameters."""
+    flags = (lean is not None, min_credibility is not None, bool(source_type))
+    count_sql, page_sql = _QUERY_SOURCES_SQL[flags]
+    params = [
+        value for value, present in zip((lean, min_credibility, source_type), flags)
+        if present
+    ]
+    return count_sql, page_sql, params
 
 
 def query_sources(
@@ -197,62 +498,86 @@ def query_sources(
     Returns:
         Tuple of (sources list, total count)
     """
+    count_sql, page_sql, params = _query_sources_sql(lean, min_credibility, source_type)
+
     with get_db_connection() as conn:
         cursor = conn.cursor()
 
-        # Build WHERE clause dynamically
-        where_clauses = []
-        params = []
-
-        if lean is not None:
-            where_clauses.append("political_lean = ?")
-            params.append(lean)
-
-        if min_credibility is not None:
-            where_clauses.append("newsguard_score >= ?")
-            params.append(min_credibility)
-
-        if source_type:
-            where_clauses.append("source_type = ?")
-            params.append(source_type)
-
-        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
-
         # Get total count
-        cursor.execute(f"SELECT COUNT(*) FROM sources WHERE {where_sql}", params)
+        cursor.execute(count_sql, params)
         total = cursor.fetchone()[0]
 
         # Get paginated results
-        cursor.execute(f"""
-            SELECT domain, name, newsguard_score, political_lean, political_lean_label,
-                   source_type, description
-            FROM sources
-            WHERE {where_sql}
-            ORDER BY newsguard_score DESC, name ASC
-            LIMIT ? OFFSET ?
-        """, (*params, limit, offset))
+        cursor.execute(page_sql, (*params, limit, offset))
 
         sources = [dict(row) for row in cursor.fetchall()]
 
         return sources, total
 
 
+# Rows per database round trip when streaming source listings
+STREAM_PAGE_SIZE = 100
+
+
+def iter_sources(
+    lean: Optional[int] = None,
+    min_credibility: Optional[int] = None,
+    source_type: Optional[str] = None,
+    limit: int = 100,
+    offset: int = 0
+) -> Iterator[dict]:
+    """
+    Yield filtered sources one row at a time, in query_sources order.
+
+    Rows are fetched in pages of STREAM_PAGE_SIZE, and the pooled connection
+    is returned between pages, so a slow reader never holds it while idle.
+
+    Args:
+        lean: Political lean filter (-2 to 2)
+        min_credibility: Minimum NewsGuard score
+        source_type: Source type filter
+        limit: Max results
+        offset: Pagination offset
+
+    Yields:
+        Source dicts
+    """
+    _, page_sql, params = _query_sources_sql(lean, min_credibility, source_type)
+
+    end = offset + limit
+    while offset < end:
+        page_size = min(STREAM_PAGE_SIZE, end - offset)
+        with get_db_connection() as conn:
+            rows = [dict(row) for row in conn.execute(page_sql, (*params, page_size, offset))]
+
+        yield from rows
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+
 def get_database_stats() -> dict:
-    """Get database statistics."""
+    """Get database statistics (cached for STATS_CACHE_TTL seconds)."""
+    with _stats_cache_lock:
+        stats = _stats_cache.get("stats")
+    if stats is not None:
+        return stats
+
     with get_db_connection() as conn:
         cursor = conn.cursor()
 
-        # Total sources
-        cursor.execute("SELECT COUNT(*) FROM sources")
-        total = cursor.fetchone()[0]
-
-        # With NewsGuard
-        cursor.execute("SELECT COUNT(*) FROM sources WHERE newsguard_score IS NOT NULL")
-        with_newsguard = cursor.fetchone()[0]
-
-        # With political lean
-        cursor.execute("SELECT COUNT(*) FROM sources WHERE political_lean IS NOT NULL")
-        with_lean = cursor.fetchone()[0]
+        # Counts and credibility tiers in a single pass over the table
+        cursor.execute("""
+            SELECT
+                COUNT(*) as total,
+                COUNT(newsguard_score) as with_newsguard,
+                COUNT(political_lean) as with_lean,
+                COUNT(CASE WHEN newsguard_score >= 80 THEN 1 END) as high,
+                COUNT(CASE WHEN newsguard_score >= 60 AND newsguard_score < 80 THEN 1 END) as medium,
+                COUNT(CASE WHEN newsguard_score < 60 THEN 1 END) as low
+            FROM sources
+        """)
+        row = cursor.fetchone()
 
         # Lean distribution
         cursor.execute("""
@@ -262,7 +587,7 @@ def get_database_stats() -> dict:
             GROUP BY political_lean_label
             ORDER BY political_lean
         """)
-        lean_distribution = {row["political_lean_label"]: row["count"] for row in cursor.fetchall()}
+        lean_distribution = {r["political_lean_label"]: r["count"] for r in cursor.fetchall()}
 
         # Type distribution
         cursor.execute("""
@@ -271,29 +596,21 @@ def get_database_stats() -> dict:
             GROUP BY source_type
             ORDER BY count DESC
         """)
-        type_distribution = {row["source_type"]: row["count"] for row in cursor.fetchall()}
-
-        # Credibility tiers
-        cursor.execute("""
-            SELECT
-                COUNT(CASE WHEN newsguard_score >= 80 THEN 1 END) as high,
-                COUNT(CASE WHEN newsguard_score >= 60 AND newsguard_score < 80 THEN 1 END) as medium,
-                COUNT(CASE WHEN newsguard_score < 60 THEN 1 END) as low
-            FROM sources
-            WHERE newsguard_score IS NOT NULL
-        """)
-        row = cursor.fetchone()
-        credibility_tiers = {
+        type_distribution = {r["source_type"]: r["count"] for r in cursor.fetchall()}
+
+    stats = {
+        "total_sources": row["total"],
+        "with_newsguard": row["with_newsguard"],
+        "with_political_lean": row["with_lean"],
+        "lean_distribution": lean_distribution,
+        "type_distribution": type_distribution,
+        "credibility_tiers": {
             "high": row["high"],
             "medium": row["medium"],
             "low": row["low"]
         }
+    }
 
-        return {
-            "total_sources": total,
-            "with_newsguard": with_newsguard,
-            "with_political_lean": with_lean,
-            "lean_distribution": lean_distribution,
-            "type_distribution": type_distribution,
-            "credibility_tiers": credibility_tiers
-        }
+    with _stats_cache_lock:
+        _stats_cache["stats"] = stats
+    return stats
@@ -0,0 +1,71 @@
+"""Lightweight containers for source data passed between the database and routes."""
+
+import sqlite3
+from dataclasses import dataclass, fields
+from typing import Optional
+
+import orjson
+
+
+@dataclass(slots=True, frozen=True)
+class SourceRow:
+    """A full sources row with its criteria JSON parsed."""
+    domain: str
+    name: Optional[str] = None
+    newsguard_score: Optional[float] = None
+    newsguard_rating: Optional[str] = None
+    criteria: Optional[dict] = None
+    political_lean: Optional[int] = None
+    political_lean_label: Optional[str] = None
+    source_type: Optional[str] = None
+    description: Optional[str] = None
+    ownership_summary: Optional[str] = None
+    created_at: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "SourceRow":
+        """
+        Build from a `SELECT *` sources row.
+
+        Args:
+            row: Row including the criteria_json column
+
+        Returns:
+            SourceRow with criteria parsed (None if missing or malformed)
+        """
+        criteria = None
+        if row["criteria_json"]:
+            try:
+                criteria = orjson.loads(row["criteria_json"])
+            except orjson.JSONDecodeError:
+                pass
+
+        return cls(
+            domain=row["domain"],
+            name=row["name"],
+            newsguard_score=row["newsguard_score"],
+            newsguard_rating=row["newsguard_rating"],
+            criteria=criteria,
+            political_lean=row["political_lean"],
+            political_lean_label=row["political_lean_label"],
+            source_type=row["source_type"],
+            description=row["description"],
+            ownership_summary=row["ownership_summary"],
+            created_at=row["created_at"]
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class CounterRow:
+    """A counternarrative candidate; the columns the counter queries select."""
+    domain: str
+    name: Optional[str]
+    newsguard_score: Optional[float]
+    political_lean: Optional[int]
+    political_lean_label: Optional[str]
+    source_type: Optional[str]
+    description: Optional[str]
+
+
+# Select list matching CounterRow's field order, so rows unpack positionally
+COUNTER_COLUMNS = ", ".join(f"s.{field.name}" for field in fields(CounterRow))
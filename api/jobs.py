@@ -0,0 +1,101 @@
+"""In-process background jobs for long-running content analyses."""
+
+import asyncio
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from cachetools import TTLCache
+
+from .config import settings
+from .models import JobStatus
+
+# Finished jobs stay pollable for an hour
+JOB_TTL = 3600
+MAX_JOBS = 10_000
+
+# Queued and running jobs are never evicted; beyond this many, submit() refuses
+MAX_PENDING_JOBS = 1_000
+
+
+@dataclass
+class Job:
+    """A submitted unit of work and its outcome."""
+    id: str
+    status: JobStatus = "queued"
+    result: Any = None
+    error: Optional[str] = None
+
+
+# Jobs move from _pending to _finished when they end, so only finished
+# jobs can expire or be evicted when the cache fills up
+_pending: dict[str, Job] = {}
+_finished: TTLCache[str, Job] = TTLCache(MAX_JOBS, JOB_TTL)
+_tasks: set[asyncio.Task] = set()
+_slots: Optional[asyncio.Semaphore] = None
+
+
+async def _run(job: Job, work: Callable[[], Awaitable[Any]]) -> None:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(settings.analysis_workers)
+
+    try:
+        # Jobs beyond the worker limit wait here in submission order
+        async with _slots:
+            job.status = "running"
+            try:
+                job.result = await work()
+                job.status = "completed"
+            except Exception as e:
+                job.error = str(e)
+                job.status = "failed"
+    finally:
+        _pending.pop(job.id, None)
+        _finished[job.id] = job
+
+
+def submit(work: Callable[[], Awaitable[Any]]) -> Optional[Job]:
+    """
+    Schedule work in the background and return its job immediately.
+
+    Args:
+        work: Zero-argument coroutine function to run
+
+    Returns:
+        The queued Job (poll it with get()), or None if MAX_PENDING_JOBS
+        jobs are already queued or running
+    """
+    if len(_pending) >= MAX_PENDING_JOBS:
+        return None
+
+    job = Job(id=uuid.uuid4().hex)
+    _pending[job.id] = job
+
+    task = asyncio.create_task(_run(job, work))
+    # Keep a strong reference until the task finishes
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+def get(job_id: str) -> Optional[Job]:
+    """
+    Look up a job by ID.
+
+    Args:
+        job_id: ID returned by submit()
+
+    Returns:
+        The Job, or None if unknown or expired
+    """
+    return _pending.get(job_id) or _finished.get(job_id)
+
+
+async def shutdown() -> None:
+    """Cancel unfinished jobs (called on app shutdown)."""
+    global _slots
+    for task in list(_tasks):
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _slots = None
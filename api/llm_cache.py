@@ -0,0 +1,98 @@
+"""Persistent cache for LLM analysis responses."""
+
+import asyncio
+import hashlib
+import sqlite3
+import time
+from typing import Optional
+
+import orjson
+
+from .config import settings
+
+# Default time-to-live for cached analyses (7 days)
+DEFAULT_TTL = 86400 * 7
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS analysis_cache (
+        key TEXT PRIMARY KEY,
+        response_json TEXT NOT NULL,
+        created_at INTEGER NOT NULL,
+        expires_at INTEGER NOT NULL
+    )
+"""
+
+
+def cache_key(model: str, content: str) -> str:
+    """
+    Build a deterministic cache key for an analysis request.
+
+    Args:
+        model: OpenRouter model ID
+        content: The (already truncated) article text sent to the model
+
+    Returns:
+        Hex SHA-256 digest of the model and content
+    """
+    return hashlib.sha256(f"{model}|{content}".encode()).hexdigest()
+
+
+def _get_sync(key: str) -> Optional[dict]:
+    conn = sqlite3.connect(settings.db_path)
+    try:
+        conn.execute(CREATE_TABLE_SQL)
+        row = conn.execute(
+            "SELECT response_json FROM analysis_cache WHERE key = ? AND expires_at > ?",
+            (key, int(time.time()))
+        ).fetchone()
+        return orjson.loads(row[0]) if row else None
+    finally:
+        conn.close()
+
+
+def _set_sync(key: str, value: dict, ttl: int) -> None:
+    now = int(time.time())
+    conn = sqlite3.connect(settings.db_path)
+    try:
+        conn.execute(CREATE_TABLE_SQL)
+        conn.execute(
+            "INSERT OR REPLACE INTO analysis_cache (key, response_json, created_at, expires_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, orjson.dumps(value).decode(), now, now + ttl)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+async def get(key: str) -> Optional[dict]:
+    """
+    Fetch a cached response.
+
+    Args:
+        key: Cache key from cache_key()
+
+    Returns:
+        The cached payload, or None on a miss or expired entry
+    """
+    try:
+        return await asyncio.to_thread(_get_sync, key)
+    except Exception as e:
+        # A broken cache must never break analysis
+        print(f"Failed to read analysis cache: {e}")
+        return None
+
+
+async def set(key: str, value: dict, ttl: int = DEFAULT_TTL) -> None:
+    """
+    Store a response in the cache.
+
+    Args:
+        key: Cache key from cache_key()
+        value: JSON-serializable payload
+        ttl: Time-to-live in seconds
+    """
+    try:
+        await asyncio.to_thread(_set_sync, key, value, ttl)
+    except Exception as e:
+        print(f"Failed to write analysis cache: {e}")
@@ -1,16 +1,52 @@
 """SourceInfo API - Main application entry point."""
 
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, RedirectResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from . import jobs
 from .config import settings
+from .database import close_db_connections
+from .usage_tracker import close_usage_connection
 from .routes import analyze, sources, content, usage
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release shared resources on shutdown."""
+    # The outbound HTTP client is created by the first content request
+    app.state.http_client = None
+    try:
+        yield
+    finally:
+        await jobs.shutdown()
+        if app.state.http_client is not None:
+            await app.state.http_client.aclose()
+        close_db_connections()
+        close_usage_connection()
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes the given request paths through uncompressed."""
+
+    def __init__(self, app: ASGIApp, exclude_paths: frozenset[str], **kwargs) -> None:
+        super().__init__(app, **kwargs)
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="SourceInfo API",
@@ -33,7 +69,9 @@ app = FastAPI(
     """,
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -51,6 +89,15 @@ app.include_router(sources.router, prefix="/api")
 app.include_router(content.router, prefix="/api")
 app.include_router(usage.router, prefix="/api")
 
+# Compress JSON responses (source listings, stats) for clients that accept gzip.
+# The SSE route is excluded: gzip holds output back until a compressed block
+# fills, so progress events would reach the client in bursts or only at the end.
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    exclude_paths=frozenset({app.url_path_for("analyze_article_stream")}),
+    minimum_size=1000
+)
+
 
 # Mount static files if they exist (production Docker build)
 static_path = Path(__file__).parent.parent / "static"
@@ -1,14 +1,34 @@
 """Pydantic models for API requests and responses."""
 
-from typing import Optional, Literal
-from pydantic import BaseModel, Field, HttpUrl
+from typing import Annotated, Optional, Literal, get_args
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+
+
+# Shared Literal types, defined once and referenced by every field that uses them
+ClaimType = Literal["political", "economic", "foreign_policy", "scientific", "general"]
+EvidenceRole = Literal["support", "refute", "neutral"]
+Recommendation = Literal["strong", "acceptable", "use_with_caution", "not_recommended"]
+JobStatus = Literal["queued", "running", "completed", "failed"]
+
+# AllSides lean: -2=Left, -1=Lean Left, 0=Center, 1=Lean Right, 2=Right
+PoliticalLean = Annotated[int, Field(ge=-2, le=2)]
+POLITICAL_LEANS = range(-2, 3)
+
+# Accepted values for ScoreRequest.context keys, for O(1) membership checks
+ALLOWED_CLAIM_TYPES = frozenset(get_args(ClaimType))
+ALLOWED_EVIDENCE_ROLES = frozenset(get_args(EvidenceRole))
+
+
+class APIModel(BaseModel):
+    """Base for all API models; validators are built on first use, not at import."""
+    model_config = ConfigDict(defer_build=True)
 
 
 # ============================================================================
 # Source Models
 # ============================================================================
 
-class SourceBase(BaseModel):
+class SourceBase(APIModel):
     """Base source information."""
     domain: str
     name: str
@@ -36,38 +56,36 @@ class SourceWithScore(SourceBase):
 # Request Models
 # ============================================================================
 
-class AnalyzeRequest(BaseModel):
+class AnalyzeRequest(APIModel):
     """Request to analyze an article URL."""
     url: str = Field(..., description="Article URL to analyze")
     include_counternarratives: bool = Field(True, description="Include counternarrative sources")
     min_counternarrative_credibility: int = Field(60, ge=0, le=100, description="Minimum NewsGuard score for counternarratives")
     counternarrative_limit: int = Field(10, ge=1, le=50, description="Maximum number of counternarratives")
-    preferred_leans: Optional[list[int]] = Field(None, description="Specific political leans to target (e.g., [1, 2] for right-leaning)")
+    preferred_leans: Optional[list[PoliticalLean]] = Field(None, description="Specific political leans to target (e.g., [1, 2] for right-leaning)")
 
 
-class BatchAnalyzeRequest(BaseModel):
+class BatchAnalyzeRequest(APIModel):
     """Request to analyze multiple URLs."""
     urls: list[str] = Field(..., description="List of article URLs to analyze")
     options: Optional[AnalyzeRequest] = Field(None, description="Analysis options (applied to all URLs)")
 
 
-class ScoreRequest(BaseModel):
+class ScoreRequest(APIModel):
     """Request to score a source for evidence quality."""
     domain: str = Field(..., description="Source domain to score")
-    context: Optional[dict] = Field(None, description="Context for scoring")
-
-    class Context(BaseModel):
-        """Scoring context."""
-        claim_type: Optional[Literal["political", "economic", "foreign_policy", "scientific", "general"]] = "general"
-        evidence_role: Optional[Literal["support", "refute", "neutral"]] = "neutral"
-        preferred_credibility: Optional[Literal["high", "medium", "any"]] = "high"
+    context: Optional[dict] = Field(
+        None,
+        description="Context for scoring: claim_type (political, economic, foreign_policy, "
+                    "scientific, general) and evidence_role (support, refute, neutral)"
+    )
 
 
 # ============================================================================
 # Response Models
 # ============================================================================
 
-class AnalyzeResponse(BaseModel):
+class AnalyzeResponse(APIModel):
     """Response from analyze endpoint."""
     url: str
     domain: str
@@ -77,7 +95,7 @@ class AnalyzeResponse(BaseModel):
     error: Optional[str] = None
 
 
-class BatchAnalyzeResponse(BaseModel):
+class BatchAnalyzeResponse(APIModel):
     """Response from batch analyze endpoint."""
     results: list[AnalyzeResponse]
     total: int
@@ -85,7 +103,7 @@ class BatchAnalyzeResponse(BaseModel):
     failed: int
 
 
-class ScoringBreakdown(BaseModel):
+class ScoringBreakdown(APIModel):
     """Breakdown of weighted scoring."""
     credibility_score: float = Field(..., description="Base NewsGuard score")
     bias_penalty: float = Field(0, description="Penalty for extreme bias (if applicable)")
@@ -93,16 +111,16 @@ class ScoringBreakdown(BaseModel):
     explanation: str = Field(..., description="Human-readable explanation")
 
 
-class ScoreResponse(BaseModel):
+class ScoreResponse(APIModel):
     """Response from score endpoint."""
     source: Optional[SourceBase] = None
     weighted_score: Optional[float] = None
     scoring_breakdown: Optional[ScoringBreakdown] = None
-    recommendation: Optional[Literal["strong", "acceptable", "use_with_caution", "not_recommended"]] = None
+    recommendation: Optional[Recommendation] = None
     error: Optional[str] = None
 
 
-class SourceListResponse(BaseModel):
+class SourceListResponse(APIModel):
     """Response from source list endpoint."""
     sources: list[SourceBase]
     total: int
@@ -111,7 +129,7 @@ class SourceListResponse(BaseModel):
     filters_applied: dict
 
 
-class CounternarrativeResponse(BaseModel):
+class CounternarrativeResponse(APIModel):
     """Response from counternarrative endpoint."""
     source_domain: str
     source_name: Optional[str] = None
@@ -120,7 +138,7 @@ class CounternarrativeResponse(BaseModel):
     total: int
 
 
-class StatsResponse(BaseModel):
+class StatsResponse(APIModel):
     """Response from stats endpoint."""
     total_sources: int
     with_newsguard: int
@@ -134,14 +152,25 @@ class StatsResponse(BaseModel):
 # Content Analysis Models
 # ============================================================================
 
-class ContentAnalysisRequest(BaseModel):
+class ContentAnalysisRequest(APIModel):
     """Request to analyze article content."""
     url: str = Field(..., description="Article URL to fetch and analyze")
-    content: Optional[str] = Field(None, description="Optional: provide content directly instead of fetching")
+    content: Optional[str] = Field(
+        None,
+        max_length=200_000,
+        description="Optional: provide content directly instead of fetching (max 200,000 characters)"
+    )
+    model: Optional[str] = Field(None, description="OpenRouter model to use (default: claude-sonnet-4)")
+
+
+class BatchContentAnalysisRequest(APIModel):
+    """Request to analyze the content of multiple articles."""
+    urls: list[str] = Field(..., description="Article URLs to fetch and analyze")
     model: Optional[str] = Field(None, description="OpenRouter model to use (default: claude-sonnet-4)")
+    concurrency: int = Field(5, ge=1, le=10, description="Maximum analyses run at the same time")
 
 
-class AnalysisScoresResponse(BaseModel):
+class AnalysisScoresResponse(APIModel):
     """Individual analysis scores (1-10 scale, except overall which is 1-100)."""
     inflammatory_language: int = Field(..., ge=1, le=10, description="1=neutral, 10=highly inflammatory")
     unsupported_claims: int = Field(..., ge=1, le=10, description="1=well-sourced, 10=many unsupported")
@@ -151,13 +180,13 @@ class AnalysisScoresResponse(BaseModel):
     overall_grade: str = Field(..., description="Letter grade A-F")
 
 
-class UnsupportedClaim(BaseModel):
+class UnsupportedClaim(APIModel):
     """An unsupported claim found in the article."""
     claim: str
     issue: str
 
 
-class ContentAnalysisResponse(BaseModel):
+class ContentAnalysisResponse(APIModel):
     """Response from content analysis endpoint."""
     url: str
     success: bool
@@ -199,18 +228,34 @@ class ContentAnalysisResponse(BaseModel):
     error: Optional[str] = None
 
 
+class BatchContentAnalysisResponse(APIModel):
+    """Response from batch content analysis endpoint."""
+    results: list[ContentAnalysisResponse]
+    total: int
+    successful: int
+    failed: int
+
+
+class ContentAnalysisJobResponse(APIModel):
+    """Status of a background content analysis job."""
+    job_id: str
+    status: JobStatus
+    result: Optional[ContentAnalysisResponse] = Field(None, description="Set once the job has completed")
+    error: Optional[str] = None
+
+
 # ============================================================================
 # Usage Stats Models
 # ============================================================================
 
-class ApiUsageBreakdown(BaseModel):
+class ApiUsageBreakdown(APIModel):
     """Usage breakdown by API."""
     api_name: str
     calls: int
     cost: float
 
 
-class ModelUsageBreakdown(BaseModel):
+class ModelUsageBreakdown(APIModel):
     """Usage breakdown by model."""
     model_used: str
     calls: int
@@ -220,7 +265,7 @@ class ModelUsageBreakdown(BaseModel):
     avg_cost_per_call: float
 
 
-class DailyUsage(BaseModel):
+class DailyUsage(APIModel):
     """Daily usage summary."""
     date: str
     calls: int
@@ -229,7 +274,7 @@ class DailyUsage(BaseModel):
     cost: float
 
 
-class ExpensiveAnalysis(BaseModel):
+class ExpensiveAnalysis(APIModel):
     """Info about an expensive analysis."""
     url: str
     model_used: Optional[str]
@@ -239,7 +284,7 @@ class ExpensiveAnalysis(BaseModel):
     timestamp: str
 
 
-class UsageTotals(BaseModel):
+class UsageTotals(APIModel):
     """Total usage metrics."""
     total_calls: int
     total_input_tokens: int
@@ -249,7 +294,7 @@ class UsageTotals(BaseModel):
     failed_calls: int
 
 
-class UsageStatsResponse(BaseModel):
+class UsageStatsResponse(APIModel):
     """Response from usage stats endpoint."""
     period_days: int
     totals: UsageTotals
@@ -263,7 +308,7 @@ class UsageStatsResponse(BaseModel):
 # Error Models
 # ============================================================================
 
-class ErrorResponse(BaseModel):
+class ErrorResponse(APIModel):
     """Standard error response."""
     error: str
     detail: Optional[str] = None
@@ -0,0 +1,124 @@
+"""Rate limiting and retry backoff for outbound API calls."""
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Optional
+
+from .config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+# Transient upstream failures worth retrying
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+MAX_ATTEMPTS = 5
+MAX_BACKOFF = 60.0
+
+
+class TokenBucket:
+    """
+    Async token bucket that paces callers to a sustained rate.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    acquire() reserves its tokens immediately and sleeps off any deficit,
+    so concurrent callers are served in arrival order without a lock.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, n: float = 1) -> None:
+        """
+        Wait until `n` tokens are available and consume them.
+
+        Args:
+            n: Tokens needed (clamped to capacity so large requests still run)
+        """
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        self._refill()
+        self._tokens -= min(n, self.capacity)
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold off new acquisitions for at least `seconds` (e.g. after a 429).
+
+        Args:
+            seconds: Delay requested by the upstream API
+        """
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+def retry_after_seconds(response: "httpx.Response") -> Optional[float]:
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date.
+
+    Args:
+        response: Upstream HTTP response
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Delay before the next retry: Retry-After if given, else exponential with jitter.
+
+    Args:
+        attempt: Zero-based index of the attempt that just failed
+        retry_after: Seconds requested by the upstream API, if any
+
+    Returns:
+        Seconds to sleep
+    """
+    if retry_after is not None:
+        return min(MAX_BACKOFF, retry_after)
+    return min(MAX_BACKOFF, 2 ** attempt + random.random())
+
+
+# OpenRouter limits apply per model; (requests, tokens) buckets keyed by model ID
+_buckets: dict[str, tuple[TokenBucket, TokenBucket]] = {}
+
+
+def openrouter_buckets(model: str) -> tuple[TokenBucket, TokenBucket]:
+    """
+    Get the requests-per-minute and tokens-per-minute buckets for a model.
+
+    Args:
+        model: OpenRouter model ID
+
+    Returns:
+        Tuple of (rpm_bucket, tpm_bucket)
+    """
+    if model not in _buckets:
+        rpm = settings.openrouter_requests_per_minute
+        tpm = settings.openrouter_tokens_per_minute
+        _buckets[model] = (TokenBucket(rpm / 60, rpm), TokenBucket(tpm / 60, tpm))
+    return _buckets[model]
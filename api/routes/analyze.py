@@ -1,25 +1,32 @@
 """Routes for analyzing article URLs and extracting source information."""
 
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Response
+from typing import Optional
 
+from .. import structs
 from ..models import (
     AnalyzeRequest,
     AnalyzeResponse,
     BatchAnalyzeRequest,
     BatchAnalyzeResponse,
-    SourceWithScore
 )
-from ..utils.url_parser import extract_domain, is_valid_url
-from ..database import lookup_source, find_counternarratives
-from ..scoring import score_source_for_context
+from ..utils.url_parser import extract_domain, is_valid_url, normalize_domain
+from ..database import (
+    run_db,
+    lookup_source_async,
+    lookup_sources_by_host,
+    find_counternarratives,
+    find_counternarratives_bulk
+)
+from ..internal_types import CounterRow, SourceRow
+from ..scoring import score_sources_for_context_bulk
 from ..config import settings
 
 router = APIRouter(prefix="/analyze", tags=["analyze"])
 
 
 @router.post("", response_model=AnalyzeResponse)
-async def analyze_url(request: AnalyzeRequest) -> AnalyzeResponse:
+async def analyze_url(request: AnalyzeRequest) -> Response:
     """
     Analyze an article URL and return source information with counternarratives.
 
@@ -34,81 +41,17 @@ async def analyze_url(request: AnalyzeRequest) -> AnalyzeResponse:
     - Claim Analysis Tool: Assess source credibility for evidence
     - Research: Understand source background and find balanced perspectives
     """
-    # Validate URL
-    if not is_valid_url(request.url):
-        return AnalyzeResponse(
-            url=request.url,
-            domain="",
-            source=None,
-            source_found=False,
-            counternarratives=None,
-            error="Invalid URL format"
-        )
-
-    # Extract domain
-    try:
-        domain = extract_domain(request.url)
-    except Exception as e:
-        return AnalyzeResponse(
-            url=request.url,
-            domain="",
-            source=None,
-            source_found=False,
-            counternarratives=None,
-            error=f"Failed to extract domain: {str(e)}"
-        )
-
-    # Lookup source
-    source = lookup_source(domain)
-
-    if not source:
-        return AnalyzeResponse(
-            url=request.url,
-            domain=domain,
-            source=None,
-            source_found=False,
-            counternarratives=None,
-            error=f"Source not found in database: {domain}"
-        )
-
-    # Find counternarratives if requested
-    counternarratives = None
-    if request.include_counternarratives:
-        counter_results = find_counternarratives(
-            domain=domain,
-            min_credibility=request.min_counternarrative_credibility,
-            limit=request.counternarrative_limit,
-            preferred_leans=request.preferred_leans
-        )
-
-        # Add weighted scores to counternarratives
-        counternarratives = []
-        for counter in counter_results:
-            scoring = score_source_for_context(
-                source=counter,
-                context={"evidence_role": "counternarrative"}
-            )
-            counter_with_score = SourceWithScore(
-                **counter,
-                weighted_score=scoring["weighted_score"]
-            )
-            counternarratives.append(counter_with_score)
-
-    return AnalyzeResponse(
-        url=request.url,
-        domain=domain,
-        source=source,
-        source_found=True,
-        counternarratives=counternarratives,
-        error=None
-    )
+    return structs.json_response(await _analyze(request))
 
 
 @router.post("/batch", response_model=BatchAnalyzeResponse)
-async def analyze_batch(request: BatchAnalyzeRequest) -> BatchAnalyzeResponse:
+async def analyze_batch(request: BatchAnalyzeRequest) -> Response:
     """
     Analyze multiple article URLs in a single request.
 
+    Sources and counternarratives for all URLs are fetched with one query
+    each, however many URLs are in the batch.
+
     Useful for:
     - Processing timeline events with multiple sources
     - Bulk evidence collection for claim analysis
@@ -123,32 +66,151 @@ async def analyze_batch(request: BatchAnalyzeRequest) -> BatchAnalyzeResponse:
     # Use default options if not provided
     options = request.options or AnalyzeRequest(url="")
 
-    results = []
-    successful = 0
-    failed = 0
-
-    for url in request.urls:
-        # Create individual request
-        analyze_request = AnalyzeRequest(
-            url=url,
-            include_counternarratives=options.include_counternarratives,
-            min_counternarrative_credibility=options.min_counternarrative_credibility,
-            counternarrative_limit=options.counternarrative_limit,
+    # Parse every URL up front, then look up all distinct hosts at once;
+    # invalid URLs get their error response without touching the database.
+    # Hosts, not registered domains, so subdomain sources still match.
+    parsed = [_parse_url(url) for url in request.urls]
+    hosts = [normalize_domain(url) if not error else "" for url, (_, error) in zip(request.urls, parsed)]
+    unique_hosts = list(dict.fromkeys(host for host in hosts if host))
+
+    sources = {}
+    if unique_hosts:
+        sources = await run_db(lookup_sources_by_host, unique_hosts)
+
+    source_leans = {
+        host: source.political_lean
+        for host, source in sources.items()
+        if source is not None and source.political_lean is not None
+    }
+
+    counters = {}
+    if options.include_counternarratives and source_leans:
+        counters = await run_db(
+            find_counternarratives_bulk,
+            source_leans,
+            min_credibility=options.min_counternarrative_credibility,
+            limit=options.counternarrative_limit,
             preferred_leans=options.preferred_leans
         )
 
-        # Analyze
-        result = await analyze_url(analyze_request)
-        results.append(result)
+    # Structs for each distinct host are built once and shared by every
+    # URL on it; the whole batch is then encoded in a single msgspec pass
+    parts = {}
+    results = []
+    for url, host, (domain, error) in zip(request.urls, hosts, parsed):
+        if error:
+            results.append(_error_response(url, error))
+            continue
 
-        if result.source_found and not result.error:
-            successful += 1
-        else:
-            failed += 1
+        if host not in parts:
+            source = sources.get(host)
+            counter_results = counters.get(host, []) if options.include_counternarratives else None
+            parts[host] = _response_parts(source, counter_results) if source else None
+        results.append(_build_response(url, domain, parts[host]))
 
-    return BatchAnalyzeResponse(
+    successful = sum(1 for result in results if result.source_found and not result.error)
+
+    return structs.json_response(structs.BatchAnalyzeResponse(
         results=results,
         total=len(request.urls),
         successful=successful,
-        failed=failed
+        failed=len(results) - successful
+    ))
+
+
+def _parse_url(url: str) -> tuple[str, Optional[str]]:
+    """Validate a URL and extract its domain; returns (domain, error message)."""
+    # Validate URL
+    if not is_valid_url(url):
+        return "", "Invalid URL format"
+
+    # Extract domain
+    try:
+        return extract_domain(url), None
+    except Exception as e:
+        return "", f"Failed to extract domain: {str(e)}"
+
+
+def _error_response(url: str, error: str) -> structs.AnalyzeResponse:
+    """Response for a URL whose domain could not be determined."""
+    return structs.AnalyzeResponse(
+        url=url,
+        domain="",
+        source=None,
+        source_found=False,
+        counternarratives=None,
+        error=error
     )
+
+
+def _response_parts(
+    source: SourceRow,
+    counter_results: Optional[list[CounterRow]]
+) -> tuple[structs.SourceDetailed, Optional[list[structs.SourceWithScore]]]:
+    """Build the source and scored counternarrative structs for a found source."""
+    # Add weighted scores to counternarratives
+    counternarratives = None
+    if counter_results is not None:
+        scores = score_sources_for_context_bulk(
+            counter_results,
+            context={"evidence_role": "counternarrative"}
+        )
+        counternarratives = [
+            structs.source_with_score(counter, score)
+            for counter, score in zip(counter_results, scores)
+        ]
+
+    return structs.convert(source, structs.SourceDetailed), counternarratives
+
+
+def _build_response(
+    url: str,
+    domain: str,
+    parts: Optional[tuple[structs.SourceDetailed, Optional[list[structs.SourceWithScore]]]]
+) -> structs.AnalyzeResponse:
+    """Assemble the analyze response; `parts` is None if the source was not found."""
+    if parts is None:
+        return structs.AnalyzeResponse(
+            url=url,
+            domain=domain,
+            source=None,
+            source_found=False,
+            counternarratives=None,
+            error=f"Source not found in database: {domain}"
+        )
+
+    source, counternarratives = parts
+    return structs.AnalyzeResponse(
+        url=url,
+        domain=domain,
+        source=source,
+        source_found=True,
+        counternarratives=counternarratives,
+        error=None
+    )
+
+
+async def _analyze(request: AnalyzeRequest) -> structs.AnalyzeResponse:
+    """Look up an article's source and its counternarratives."""
+    domain, error = _parse_url(request.url)
+    if error:
+        return _error_response(request.url, error)
+
+    # Look up by host, not the registered domain: sources stored under a
+    # subdomain (abcnews.go.com, news.yahoo.com) must still match
+    host = normalize_domain(request.url)
+    source = await lookup_source_async(host)
+
+    # Find counternarratives if requested
+    counter_results = None
+    if source and request.include_counternarratives:
+        counter_results = await run_db(
+            find_counternarratives,
+            domain=host,
+            min_credibility=request.min_counternarrative_credibility,
+            limit=request.counternarrative_limit,
+            preferred_leans=request.preferred_leans
+        )
+
+    parts = _response_parts(source, counter_results) if source else None
+    return _build_response(request.url, domain, parts)
@@ -1,22 +1,60 @@
 """Routes for article content analysis."""
 
-from fastapi import APIRouter
+import asyncio
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
 from ..models import (
     ContentAnalysisRequest,
     ContentAnalysisResponse,
+    BatchContentAnalysisRequest,
+    BatchContentAnalysisResponse,
+    ContentAnalysisJobResponse,
     AnalysisScoresResponse,
     UnsupportedClaim,
 )
+from .. import jobs, structs
 from ..content_fetcher import fetch_article_content, create_manual_content
 from ..content_analyzer import analyze_content
 from ..config import settings
 
+if TYPE_CHECKING:
+    import httpx
+
 router = APIRouter(prefix="/content", tags=["content"])
 
 
+def get_http_client(request: Request) -> "httpx.AsyncClient":
+    """
+    Return the app's shared HTTP client, creating it on first use.
+
+    Deferring creation keeps httpx (and h2) out of app startup; the lifespan
+    closes the client on shutdown. Apps served without the lifespan (e.g.
+    TestClient(app) outside a with block) still get a client, created the
+    same way, which is simply left for process exit to close.
+    """
+    client = getattr(request.app.state, "http_client", None)
+    if client is None:
+        import httpx
+
+        # One pooled client for all outbound calls (Jina, OpenRouter) so
+        # connections and TLS sessions are reused across requests
+        client = request.app.state.http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(120.0, connect=10.0)
+        )
+    return client
+
+
 @router.post("/analyze", response_model=ContentAnalysisResponse)
-async def analyze_article(request: ContentAnalysisRequest) -> ContentAnalysisResponse:
+async def analyze_article(
+    request: ContentAnalysisRequest,
+    client: "httpx.AsyncClient" = Depends(get_http_client)
+) -> Response:
     """
     Analyze an article for quality, bias, and reliability.
 
@@ -35,13 +73,162 @@ async def analyze_article(request: ContentAnalysisRequest) -> ContentAnalysisRes
     - Identify potential bias or manipulation in news coverage
     - Compare reporting quality across sources
     """
+    return structs.json_response(await _run_analysis(request, client))
+
+
+@router.post("/analyze/stream")
+async def analyze_article_stream(
+    request: ContentAnalysisRequest,
+    client: "httpx.AsyncClient" = Depends(get_http_client)
+) -> StreamingResponse:
+    """
+    Analyze an article, streaming progress as server-sent events.
+
+    Emits `progress` events carrying each completion fragment as the LLM
+    generates it, then a single `result` event with the same payload as
+    POST /content/analyze.
+    """
+    queue: asyncio.Queue[Optional[str]] = asyncio.Queue()
+
+    async def on_delta(fragment: str) -> None:
+        await queue.put(fragment)
+
+    async def events():
+        task = asyncio.create_task(_run_analysis(request, client, on_delta))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            received = 0
+            while (fragment := await queue.get()) is not None:
+                received += len(fragment)
+                data = orjson.dumps({"delta": fragment, "chars": received}).decode()
+                yield f"event: progress\ndata: {data}\n\n"
+
+            try:
+                result = task.result()
+            except Exception as e:
+                # Headers are already sent, so report the failure as an event
+                print(f"Streaming analysis failed: {e}")
+                data = orjson.dumps({"error": str(e)}).decode()
+                yield f"event: error\ndata: {data}\n\n"
+                return
+
+            yield f"event: result\ndata: {result.model_dump_json()}\n\n"
+        finally:
+            # Stop the analysis if the client disconnected before it finished
+            task.cancel()
+
+    # main.py excludes this route from GZip compression, which would buffer events
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@router.post("/analyze/batch", response_model=BatchContentAnalysisResponse)
+async def analyze_articles_batch(
+    request: BatchContentAnalysisRequest,
+    client: "httpx.AsyncClient" = Depends(get_http_client)
+) -> Response:
+    """
+    Fetch and analyze multiple articles in a single request.
+
+    Up to `concurrency` articles are fetched and analyzed at the same time;
+    results are returned in the same order as the input URLs.
+    """
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="URLs list cannot be empty")
+
+    if len(request.urls) > 50:
+        raise HTTPException(status_code=400, detail="Maximum 50 URLs per batch request")
+
+    semaphore = asyncio.Semaphore(request.concurrency)
+
+    async def analyze_one(url: str) -> ContentAnalysisResponse:
+        async with semaphore:
+            return await _run_analysis(
+                ContentAnalysisRequest(url=url, model=request.model),
+                client
+            )
+
+    outcomes = await asyncio.gather(
+        *(analyze_one(url) for url in request.urls),
+        return_exceptions=True
+    )
+
+    results = [
+        outcome if isinstance(outcome, ContentAnalysisResponse)
+        else ContentAnalysisResponse(url=url, success=False, error=f"Analysis failed: {outcome}")
+        for url, outcome in zip(request.urls, outcomes)
+    ]
+    successful = sum(1 for result in results if result.success)
+
+    return structs.json_response(BatchContentAnalysisResponse(
+        results=results,
+        total=len(results),
+        successful=successful,
+        failed=len(results) - successful
+    ))
+
+
+@router.post("/analyze/jobs", response_model=ContentAnalysisJobResponse, status_code=202)
+async def submit_analysis_job(
+    request: ContentAnalysisRequest,
+    client: "httpx.AsyncClient" = Depends(get_http_client)
+) -> Response:
+    """
+    Queue an article for analysis and return immediately.
+
+    Poll GET /analyze/jobs/{job_id} for the result. At most ANALYSIS_WORKERS
+    jobs run at once; the rest wait in submission order. Returns 503 while
+    the pending queue is full.
+    """
+    job = jobs.submit(lambda: _run_analysis(request, client))
+    if job is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many analysis jobs pending; retry later"
+        )
+    return structs.json_response(
+        ContentAnalysisJobResponse(job_id=job.id, status=job.status),
+        status_code=202
+    )
+
+
+@router.get("/analyze/jobs/{job_id}", response_model=ContentAnalysisJobResponse)
+async def get_analysis_job(job_id: str) -> Response:
+    """
+    Get the status, and once completed the result, of an analysis job.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job not found: {job_id}"
+        )
+
+    return structs.json_response(ContentAnalysisJobResponse(
+        job_id=job.id,
+        status=job.status,
+        result=job.result,
+        error=job.error
+    ))
+
+
+async def _run_analysis(
+    request: ContentAnalysisRequest,
+    client: "httpx.AsyncClient",
+    on_delta: Optional[Callable[[str], Awaitable[None]]] = None
+) -> ContentAnalysisResponse:
+    """Fetch (if needed) and analyze an article, building the API response."""
     # Step 1: Get article content
     if request.content:
         # User provided content directly
         article = create_manual_content(request.url, request.content)
     else:
         # Fetch content using Jina AI
-        article = await fetch_article_content(request.url)
+        article = await fetch_article_content(request.url, client)
 
         if not article.success:
             return ContentAnalysisResponse(
@@ -56,7 +243,9 @@ async def analyze_article(request: ContentAnalysisRequest) -> ContentAnalysisRes
     analysis = await analyze_content(
         url=request.url,
         content=article.content,
-        model=model
+        client=client,
+        model=model,
+        on_delta=on_delta
     )
 
     if not analysis.success:
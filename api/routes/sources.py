@@ -1,38 +1,44 @@
 """Routes for querying and managing sources."""
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
+from .. import structs
 from ..models import (
     SourceDetailed,
     SourceListResponse,
     CounternarrativeResponse,
     ScoreRequest,
+    ALLOWED_CLAIM_TYPES,
+    ALLOWED_EVIDENCE_ROLES,
+    POLITICAL_LEANS,
     ScoreResponse,
     StatsResponse,
-    SourceWithScore
 )
 from ..database import (
-    lookup_source,
+    run_db,
+    lookup_source_async,
     lookup_sources_bulk,
     query_sources,
+    iter_sources,
     find_counternarratives,
     get_database_stats
 )
-from ..scoring import score_source_for_context
+from ..scoring import score_source_for_context, score_sources_for_context_bulk
 
 router = APIRouter(prefix="/sources", tags=["sources"])
 
 
 @router.get("/{domain}", response_model=SourceDetailed)
-async def get_source(domain: str) -> SourceDetailed:
+async def get_source(domain: str, request: Request) -> Response:
     """
     Get detailed information about a specific source by domain.
 
     Returns full source details including NewsGuard criteria breakdown,
     ownership information, and metadata.
     """
-    source = lookup_source(domain)
+    source = await lookup_source_async(domain)
 
     if not source:
         raise HTTPException(
@@ -40,7 +46,7 @@ async def get_source(domain: str) -> SourceDetailed:
             detail=f"Source not found: {domain}"
         )
 
-    return SourceDetailed(**source)
+    return structs.cacheable_json_response(structs.convert(source, structs.SourceDetailed), request)
 
 
 @router.get("", response_model=SourceListResponse)
@@ -50,8 +56,9 @@ async def list_sources(
     min_credibility: Optional[int] = Query(None, ge=0, le=100, description="Minimum NewsGuard score"),
     source_type: Optional[str] = Query(None, description="Source type (news_media, fact_check, etc.)"),
     limit: int = Query(100, ge=1, le=500, description="Maximum results"),
-    offset: int = Query(0, ge=0, description="Pagination offset")
-) -> SourceListResponse:
+    offset: int = Query(0, ge=0, description="Pagination offset"),
+    stream: bool = Query(False, description="Stream matching sources as newline-delimited JSON (filtered queries only)")
+) -> Response:
     """
     List or search sources with optional filters.
 
@@ -59,6 +66,7 @@ async def list_sources(
     - Bulk lookup by domains
     - Filtering by political lean, credibility, type
     - Pagination
+    - Streaming as ND-JSON (one SourceBase per line, no totals) with stream=true
 
     Use Cases:
     - Get all Center sources with high credibility for neutral evidence
@@ -67,19 +75,37 @@ async def list_sources(
     """
     # Handle bulk lookup
     if domains:
-        domain_list = [d.strip() for d in domains.split(",")]
-        result_dict = lookup_sources_bulk(domain_list)
-
-        return SourceListResponse(
-            sources=list(result_dict.values()),
+        # Domains are case-insensitive; drop blanks and repeats, keeping order
+        domain_list = list(dict.fromkeys(
+            d.strip().lower() for d in domains.split(",") if d.strip()
+        ))
+        result_dict = await run_db(lookup_sources_bulk, domain_list)
+
+        return structs.json_response(structs.SourceListResponse(
+            sources=structs.convert(list(result_dict.values()), list[structs.SourceBase]),
             total=len(result_dict),
             limit=limit,
             offset=0,
             filters_applied={"domains": domain_list}
+        ))
+
+    # Stream rows straight from the cursor instead of building the full list
+    if stream:
+        rows = iter_sources(
+            lean=lean,
+            min_credibility=min_credibility,
+            source_type=source_type,
+            limit=limit,
+            offset=offset
+        )
+        return StreamingResponse(
+            (structs.ndjson_line(structs.convert(row, structs.SourceBase)) for row in rows),
+            media_type="application/x-ndjson"
         )
 
     # Handle filtered query
-    sources, total = query_sources(
+    sources, total = await run_db(
+        query_sources,
         lean=lean,
         min_credibility=min_credibility,
         source_type=source_type,
@@ -87,21 +113,20 @@ async def list_sources(
         offset=offset
     )
 
-    filters_applied = {}
-    if lean is not None:
-        filters_applied["lean"] = lean
-    if min_credibility is not None:
-        filters_applied["min_credibility"] = min_credibility
-    if source_type:
-        filters_applied["source_type"] = source_type
+    # An empty source_type is no filter, matching query_sources
+    filters_applied = {
+        key: value
+        for key, value in (("lean", lean), ("min_credibility", min_credibility), ("source_type", source_type))
+        if value is not None and value != ""
+    }
 
-    return SourceListResponse(
-        sources=sources,
+    return structs.json_response(structs.SourceListResponse(
+        sources=structs.convert(sources, list[structs.SourceBase]),
         total=total,
         limit=limit,
         offset=offset,
         filters_applied=filters_applied
-    )
+    ))
 
 
 @router.get("/{domain}/counternarratives", response_model=CounternarrativeResponse)
@@ -110,7 +135,7 @@ async def get_counternarratives(
     min_credibility: int = Query(60, ge=0, le=100, description="Minimum NewsGuard score"),
     limit: int = Query(10, ge=1, le=50, description="Maximum results"),
     preferred_leans: Optional[str] = Query(None, description="Comma-separated lean values (e.g., '1,2' for right-leaning)")
-) -> CounternarrativeResponse:
+) -> Response:
     """
     Find counternarrative sources for a given source domain.
 
@@ -123,7 +148,7 @@ async def get_counternarratives(
     - Research: Understand multiple viewpoints on an issue
     """
     # Lookup source to get name and lean
-    source = lookup_source(domain)
+    source = await lookup_source_async(domain)
 
     if not source:
         raise HTTPException(
@@ -141,9 +166,15 @@ async def get_counternarratives(
                 status_code=400,
                 detail="Invalid preferred_leans format. Use comma-separated integers (e.g., '1,2')"
             )
+        if any(lean not in POLITICAL_LEANS for lean in preferred_leans_list):
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid preferred_leans value. Leans range from -2 (Left) to 2 (Right)"
+            )
 
     # Find counternarratives
-    counters = find_counternarratives(
+    counters = await run_db(
+        find_counternarratives,
         domain=domain,
         min_credibility=min_credibility,
         limit=limit,
@@ -151,29 +182,26 @@ async def get_counternarratives(
     )
 
     # Add weighted scores
-    scored_counters = []
-    for counter in counters:
-        scoring = score_source_for_context(
-            source=counter,
-            context={"evidence_role": "counternarrative"}
-        )
-        counter_with_score = SourceWithScore(
-            **counter,
-            weighted_score=scoring["weighted_score"]
-        )
-        scored_counters.append(counter_with_score)
+    scores = score_sources_for_context_bulk(
+        counters,
+        context={"evidence_role": "counternarrative"}
+    )
+    scored_counters = [
+        structs.source_with_score(counter, score)
+        for counter, score in zip(counters, scores)
+    ]
 
-    return CounternarrativeResponse(
+    return structs.json_response(structs.CounternarrativeResponse(
         source_domain=domain,
-        source_name=source.get("name"),
-        source_lean=source.get("political_lean_label"),
+        source_name=source.name,
+        source_lean=source.political_lean_label,
         counternarratives=scored_counters,
         total=len(scored_counters)
-    )
+    ))
 
 
 @router.post("/score", response_model=ScoreResponse)
-async def score_source(request: ScoreRequest) -> ScoreResponse:
+async def score_source(request: ScoreRequest) -> Response:
     """
     Calculate weighted evidence quality score for a source given context.
 
@@ -182,34 +210,49 @@ async def score_source(request: ScoreRequest) -> ScoreResponse:
     - Prioritize sources based on evidence role (support/refute/neutral)
     - Weight fact-checkers higher for verification tasks
     """
-    source = lookup_source(request.domain)
+    if request.context:
+        _check_context_value(request.context, "claim_type", ALLOWED_CLAIM_TYPES)
+        _check_context_value(request.context, "evidence_role", ALLOWED_EVIDENCE_ROLES)
+
+    source = await lookup_source_async(request.domain)
 
     if not source:
-        return ScoreResponse(
+        return structs.json_response(structs.ScoreResponse(
             source=None,
             weighted_score=None,
             scoring_breakdown=None,
             recommendation=None,
             error=f"Source not found: {request.domain}"
-        )
+        ))
 
     # Score with context
     scoring = score_source_for_context(
         source=source,
-        context=request.context.dict() if request.context else None
+        context=request.context
     )
 
-    return ScoreResponse(
-        source=source,
-        weighted_score=scoring["weighted_score"],
-        scoring_breakdown=scoring["scoring_breakdown"],
+    return structs.json_response(structs.ScoreResponse(
+        source=structs.convert(source, structs.SourceBase),
+        # float(): round(100, 1) is an int, and structs built directly aren't coerced
+        weighted_score=float(scoring["weighted_score"]),
+        scoring_breakdown=structs.convert(scoring["scoring_breakdown"], structs.ScoringBreakdown),
         recommendation=scoring["recommendation"],
         error=None
-    )
+    ))
+
+
+def _check_context_value(context: dict, key: str, allowed: frozenset[str]) -> None:
+    """Reject a scoring context value outside its allowed set (missing/null is fine)."""
+    value = context.get(key)
+    if value is not None and (not isinstance(value, str) or value not in allowed):
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid {key}: {value!r}. Must be one of: {', '.join(sorted(allowed))}"
+        )
 
 
 @router.get("/stats/overview", response_model=StatsResponse)
-async def get_stats() -> StatsResponse:
+async def get_stats(request: Request) -> Response:
     """
     Get database statistics and source distribution metrics.
 
@@ -219,5 +262,5 @@ async def get_stats() -> StatsResponse:
     - Type distribution (news_media, fact_check, etc.)
     - Credibility tiers (high/medium/low)
     """
-    stats = get_database_stats()
-    return StatsResponse(**stats)
+    stats = await run_db(get_database_stats)
+    return structs.cacheable_json_response(structs.convert(stats, structs.StatsResponse), request)
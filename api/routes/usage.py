@@ -1,7 +1,9 @@
 """Routes for API usage statistics and cost tracking."""
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 
+from .. import structs
+from ..database import run_db
 from ..models import UsageStatsResponse
 from ..usage_tracker import get_usage_stats
 
@@ -11,7 +13,7 @@ router = APIRouter(prefix="/usage", tags=["usage"])
 @router.get("/stats", response_model=UsageStatsResponse)
 async def get_stats(
     days: int = Query(30, ge=1, le=365, description="Number of days to include in stats")
-) -> UsageStatsResponse:
+) -> Response:
     """
     Get API usage statistics and cost breakdown.
 
@@ -28,6 +30,6 @@ async def get_stats(
     - Track usage patterns
     - Budget planning
     """
-    stats = get_usage_stats(days=days)
+    stats = await run_db(get_usage_stats, days=days)
 
-    return UsageStatsResponse(**stats)
+    return structs.json_response(structs.convert(stats, structs.UsageStatsResponse))
@@ -1,7 +1,74 @@
 """Weighted scoring logic for source credibility and evidence quality."""
 
-from typing import Optional, Literal
-from .models import ScoringBreakdown
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Iterable, Optional
+from .internal_types import CounterRow, SourceRow
+from .models import Recommendation, ScoringBreakdown
+
+
+# Credibility tiers by NewsGuard score: below 60, 60-79, 80 and up
+_TIER_THRESHOLDS = (60, 80)
+_TIERS = ("low", "medium", "high")
+
+# Claim types where think tanks' policy expertise earns the larger bonus
+_CLAIM_BUCKET = {
+    "political": "policy",
+    "economic": "policy",
+    "foreign_policy": "policy",
+}
+
+# Type bonus by (source_type, claim bucket); unlisted pairs get no bonus
+_TYPE_BONUS = {
+    # Fact-checkers get universal bonus
+    ("fact_check", "policy"): 10,
+    ("fact_check", "other"): 10,
+    # Think tanks bonus for policy/economic claims
+    ("think_tank", "policy"): 5,
+    ("think_tank", "other"): 2,
+    ("think_tank___policy_group", "policy"): 5,
+    ("think_tank___policy_group", "other"): 2,
+    # Wire services bonus for factual reporting
+    ("wire_service", "policy"): 5,
+    ("wire_service", "other"): 5,
+    # Trade publications bonus for industry-specific claims
+    ("trade_publication", "policy"): 3,
+    ("trade_publication", "other"): 3,
+}
+
+# The same bonuses split per claim bucket, for scoring many sources at once
+_TYPE_BONUS_BY_BUCKET = {
+    bucket: {
+        source_type: points
+        for (source_type, claim_bucket), points in _TYPE_BONUS.items()
+        if claim_bucket == bucket
+    }
+    for bucket in ("policy", "other")
+}
+
+# Whether an evidence role is penalized for bias. Only neutral evidence is;
+# partisan and counternarrative evidence seek a perspective.
+_ROLE_APPLIES_PENALTY = {
+    "neutral": True,
+    "support": False,
+    "refute": False,
+    "counternarrative": False,
+}
+
+# Bias penalty by political_lean; center and unknown (None) lean get none
+_BIAS_PENALTY = {
+    -2: -10, 2: -10,  # Left or Right
+    -1: -5, 1: -5,    # Lean Left or Lean Right
+}
+
+# AllSides lean labels for explanations
+_LEAN_LABELS = {-2: "Left", -1: "Lean Left", 0: "Center", 1: "Lean Right", 2: "Right"}
+
+# Recommendations by weighted score: below 40, 40-59, 60-79, 80 and up
+_RECOMMENDATION_THRESHOLDS = (40, 60, 80)
+_RECOMMENDATIONS: tuple[Recommendation, ...] = (
+    "not_recommended", "use_with_caution", "acceptable", "strong"
+)
 
 
 def get_credibility_tier(score: Optional[float]) -> str:
@@ -16,11 +83,7 @@ def get_credibility_tier(score: Optional[float]) -> str:
     """
     if score is None:
         return "unknown"
-    if score >= 80:
-        return "high"
-    if score >= 60:
-        return "medium"
-    return "low"
+    return _TIERS[bisect_right(_TIER_THRESHOLDS, score)]
 
 
 def calculate_type_bonus(
@@ -37,28 +100,7 @@ def calculate_type_bonus(
     Returns:
         Bonus points (0-10)
     """
-    if not source_type:
-        return 0
-
-    # Fact-checkers get universal bonus
-    if source_type == "fact_check":
-        return 10
-
-    # Think tanks bonus for policy/economic claims
-    if source_type in ("think_tank", "think_tank___policy_group"):
-        if claim_type in ("political", "economic", "foreign_policy"):
-            return 5
-        return 2
-
-    # Wire services bonus for factual reporting
-    if source_type == "wire_service":
-        return 5
-
-    # Trade publications bonus for industry-specific claims
-    if source_type == "trade_publication":
-        return 3
-
-    return 0
+    return _TYPE_BONUS.get((source_type, _CLAIM_BUCKET.get(claim_type, "other")), 0)
 
 
 def calculate_bias_penalty(
@@ -75,26 +117,9 @@ def calculate_bias_penalty(
     Returns:
         Penalty points (0-10, negative value)
     """
-    if political_lean is None:
+    if not _ROLE_APPLIES_PENALTY.get(evidence_role, False):
         return 0
-
-    # For counternarratives, no penalty (we WANT opposite bias)
-    if evidence_role == "counternarrative":
-        return 0
-
-    # For partisan evidence, no penalty (we're seeking a perspective)
-    if evidence_role in ("support", "refute"):
-        return 0
-
-    # For neutral evidence, penalize extreme bias
-    if evidence_role == "neutral":
-        abs_lean = abs(political_lean)
-        if abs_lean == 2:  # Left or Right
-            return -10
-        if abs_lean == 1:  # Lean Left or Lean Right
-            return -5
-
-    return 0
+    return _BIAS_PENALTY.get(political_lean, 0)
 
 
 def calculate_weighted_score(
@@ -142,11 +167,11 @@ def calculate_weighted_score(
         explanation_parts.append(f"+{type_bonus} type bonus ({source_type})")
 
     if bias_penalty < 0:
-        lean_label = {-2: "Left", -1: "Lean Left", 0: "Center", 1: "Lean Right", 2: "Right"}.get(political_lean, "Unknown")
+        lean_label = _LEAN_LABELS.get(political_lean, "Unknown")
         explanation_parts.append(f"{bias_penalty} bias penalty (extreme {lean_label} for neutral evidence)")
 
     if evidence_role == "counternarrative":
-        lean_label = {-2: "Left", -1: "Lean Left", 0: "Center", 1: "Lean Right", 2: "Right"}.get(political_lean, "Unknown")
+        lean_label = _LEAN_LABELS.get(political_lean, "Unknown")
         explanation_parts.append(f"Counternarrative perspective ({lean_label})")
 
     full_explanation = "; ".join(explanation_parts)
@@ -164,7 +189,7 @@ def calculate_weighted_score(
 def get_recommendation(
     weighted_score: float,
     credibility_tier: str
-) -> Literal["strong", "acceptable", "use_with_caution", "not_recommended"]:
+) -> Recommendation:
     """
     Get recommendation based on weighted score.
 
@@ -178,54 +203,99 @@ def get_recommendation(
     if credibility_tier == "unknown":
         return "use_with_caution"
 
-    if weighted_score >= 80:
-        return "strong"
-    elif weighted_score >= 60:
-        return "acceptable"
-    elif weighted_score >= 40:
-        return "use_with_caution"
-    else:
-        return "not_recommended"
+    return _RECOMMENDATIONS[bisect_right(_RECOMMENDATION_THRESHOLDS, weighted_score)]
 
 
 def score_source_for_context(
-    source: dict,
+    source: SourceRow | CounterRow,
     context: Optional[dict] = None
 ) -> dict:
     """
     Score a source given a specific context.
 
     Args:
-        source: Source dictionary from database
+        source: Source row from database
         context: Optional context dict with claim_type, evidence_role, etc.
 
     Returns:
         Dict with weighted_score, scoring_breakdown, and recommendation
     """
-    # Extract context parameters
-    claim_type = "general"
-    evidence_role = "neutral"
+    claim_type, evidence_role = _context_params(context)
+
+    return dict(_score_cached(
+        source.newsguard_score,
+        source.source_type,
+        source.political_lean,
+        claim_type,
+        evidence_role
+    ))
+
+
+def score_sources_for_context_bulk(
+    sources: Iterable[SourceRow | CounterRow],
+    context: Optional[dict] = None
+) -> list[float]:
+    """
+    Weighted scores for many sources under one shared context.
+
+    Equivalent to score_source_for_context(...)["weighted_score"] per
+    source, but the bonus and penalty tables are narrowed to the context
+    once and each source costs two dict lookups and a clamp; no breakdown
+    or explanation is built.
+
+    Args:
+        sources: Source rows from database
+        context: Optional context dict with claim_type, evidence_role, etc.
+
+    Returns:
+        Weighted score for each source, in order
+    """
+    claim_type, evidence_role = _context_params(context)
+
+    # Narrow both tables to this context, keyed by the per-source field alone
+    bonus = _TYPE_BONUS_BY_BUCKET[_CLAIM_BUCKET.get(claim_type, "other")].get
+    penalty = (_BIAS_PENALTY if _ROLE_APPLIES_PENALTY.get(evidence_role, False) else {}).get
+
+    scores = []
+    for source in sources:
+        base = 50 if source.newsguard_score is None else source.newsguard_score
+        adjustment = bonus(source.source_type, 0) + penalty(source.political_lean, 0)
+        scores.append(round(max(0, min(100, base + adjustment)), 1))
+    return scores
+
+
+def _context_params(context: Optional[dict]) -> tuple[str, str]:
+    """Extract (claim_type, evidence_role) from a scoring context."""
+    if not context:
+        return "general", "neutral"
+    return context.get("claim_type", "general"), context.get("evidence_role", "neutral")
 
-    if context:
-        claim_type = context.get("claim_type", "general")
-        evidence_role = context.get("evidence_role", "neutral")
 
-    # Calculate weighted score
+@lru_cache(maxsize=4096)
+def _score_cached(
+    base_credibility: Optional[float],
+    source_type: Optional[str],
+    political_lean: Optional[int],
+    claim_type: str,
+    evidence_role: str
+) -> tuple[tuple[str, object], ...]:
+    # Scores depend only on these fields, so the cache never goes stale
+    # when source data is rebuilt
     weighted_score, breakdown = calculate_weighted_score(
-        base_credibility=source.get("newsguard_score"),
-        source_type=source.get("source_type"),
-        political_lean=source.get("political_lean"),
+        base_credibility=base_credibility,
+        source_type=source_type,
+        political_lean=political_lean,
         claim_type=claim_type,
         evidence_role=evidence_role
     )
 
     # Get credibility tier and recommendation
-    tier = get_credibility_tier(source.get("newsguard_score"))
+    tier = get_credibility_tier(base_credibility)
     recommendation = get_recommendation(weighted_score, tier)
 
-    return {
-        "weighted_score": round(weighted_score, 1),
-        "scoring_breakdown": breakdown,
-        "recommendation": recommendation,
-        "credibility_tier": tier
-    }
+    return (
+        ("weighted_score", round(weighted_score, 1)),
+        ("scoring_breakdown", breakdown),
+        ("recommendation", recommendation),
+        ("credibility_tier", tier)
+    )
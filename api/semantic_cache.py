@@ -0,0 +1,191 @@
+"""Near-duplicate cache for LLM analyses of syndicated or lightly edited articles.
+
+Articles are fingerprinted with a 64-bit SimHash over word shingles. Two
+texts whose fingerprints differ in only a few bits are near-duplicates, so
+a stored analysis can be reused instead of calling the LLM again. The
+fingerprint is split into eight 8-bit bands stored as indexed columns: any
+pair within MAX_DISTANCE (< 8) bits must share at least one band exactly,
+which turns the similarity search into a few indexed equality lookups.
+
+Fingerprints expire after the same TTL as the exact-match analysis cache.
+"""
+
+import asyncio
+import hashlib
+import re
+import sqlite3
+import time
+from typing import Optional
+
+import orjson
+
+from .config import settings
+from .llm_cache import DEFAULT_TTL
+
+# Maximum Hamming distance (out of 64 bits) to treat two articles as the same
+MAX_DISTANCE = 6
+
+# Texts with fewer shingles than this give unstable fingerprints
+MIN_SHINGLES = 50
+
+SHINGLE_SIZE = 3
+BAND_BITS = 8
+BAND_COUNT = 64 // BAND_BITS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+_WORD_RE = re.compile(r"\w+")
+
+_BAND_COLUMNS = [f"band{i}" for i in range(BAND_COUNT)]
+
+CREATE_SQL = [
+    f"""
+    CREATE TABLE IF NOT EXISTS analysis_fingerprints (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        model TEXT NOT NULL,
+        simhash INTEGER NOT NULL,
+        {", ".join(f"{col} INTEGER NOT NULL" for col in _BAND_COLUMNS)},
+        response_json TEXT NOT NULL,
+        created_at INTEGER NOT NULL
+    )
+    """,
+    *(
+        f"CREATE INDEX IF NOT EXISTS idx_fingerprints_{col} ON analysis_fingerprints(model, {col})"
+        for col in _BAND_COLUMNS
+    ),
+    "CREATE INDEX IF NOT EXISTS idx_fingerprints_created ON analysis_fingerprints(created_at)",
+]
+
+# One indexed lookup per band; a near-duplicate matches at least one of them
+FIND_SQL = " UNION ALL ".join(
+    f"SELECT simhash, response_json FROM analysis_fingerprints "
+    f"WHERE model = ? AND {col} = ? AND created_at > ?"
+    for col in _BAND_COLUMNS
+)
+
+PRUNE_SQL = "DELETE FROM analysis_fingerprints WHERE created_at <= ?"
+
+INSERT_SQL = (
+    f"INSERT INTO analysis_fingerprints (model, simhash, {', '.join(_BAND_COLUMNS)}, response_json, created_at) "
+    f"VALUES (?, ?, {', '.join('?' * BAND_COUNT)}, ?, ?)"
+)
+
+
+def fingerprint(text: str) -> Optional[int]:
+    """
+    Compute the 64-bit SimHash of a text.
+
+    Args:
+        text: Article text
+
+    Returns:
+        Unsigned 64-bit fingerprint, or None if the text is too short
+    """
+    words = _WORD_RE.findall(text.lower())
+    shingles = {
+        " ".join(words[i:i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+    if len(shingles) < MIN_SHINGLES:
+        return None
+
+    weights = [0] * 64
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def _bands(simhash: int) -> list[int]:
+    return [(simhash >> (i * BAND_BITS)) & BAND_MASK for i in range(BAND_COUNT)]
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(settings.db_path)
+    for statement in CREATE_SQL:
+        conn.execute(statement)
+    return conn
+
+
+def _find_sync(model: str, content: str) -> tuple[Optional[dict], Optional[int]]:
+    # Fingerprinting is CPU-heavy, so it runs here, off the event loop
+    simhash = fingerprint(content)
+    if simhash is None:
+        return None, None
+
+    cutoff = int(time.time()) - DEFAULT_TTL
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            FIND_SQL,
+            [value for band in _bands(simhash) for value in (model, band, cutoff)]
+        ).fetchall()
+    finally:
+        conn.close()
+
+    best = None
+    best_distance = MAX_DISTANCE + 1
+    for stored, response_json in rows:
+        distance = ((stored & 0xFFFFFFFFFFFFFFFF) ^ simhash).bit_count()
+        if distance < best_distance:
+            best, best_distance = response_json, distance
+
+    return (orjson.loads(best) if best else None), simhash
+
+
+def _add_sync(model: str, simhash: int, value: dict) -> None:
+    now = int(time.time())
+    conn = _connect()
+    try:
+        # Drop expired fingerprints so the table doesn't grow forever
+        conn.execute(PRUNE_SQL, (now - DEFAULT_TTL,))
+        conn.execute(
+            INSERT_SQL,
+            (model, _to_signed(simhash), *_bands(simhash), orjson.dumps(value).decode(), now)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+async def find_similar(model: str, content: str) -> tuple[Optional[dict], Optional[int]]:
+    """
+    Find a stored analysis of a near-duplicate article.
+
+    Args:
+        model: OpenRouter model ID the analysis must come from
+        content: The (already truncated) article text
+
+    Returns:
+        Tuple of (closest unexpired payload within MAX_DISTANCE or None,
+        the article's fingerprint for add(), or None if it has none)
+    """
+    try:
+        return await asyncio.to_thread(_find_sync, model, content)
+    except Exception as e:
+        # A broken cache must never break analysis
+        print(f"Failed to read semantic cache: {e}")
+        return None, None
+
+
+async def add(model: str, simhash: Optional[int], value: dict) -> None:
+    """
+    Store an analysis under the fingerprint of its article.
+
+    Args:
+        model: OpenRouter model ID that produced the analysis
+        simhash: Fingerprint returned by find_similar() (None skips storing)
+        value: JSON-serializable payload
+    """
+    if simhash is None:
+        return
+    try:
+        await asyncio.to_thread(_add_sync, model, simhash, value)
+    except Exception as e:
+        print(f"Failed to write semantic cache: {e}")
@@ -0,0 +1,274 @@
+"""msgspec mirrors of the read-path response models, for fast JSON encoding."""
+
+import hashlib
+from typing import Any, Optional
+
+import msgspec
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from .internal_types import CounterRow
+
+# These structs encode exactly the JSON the pydantic response models in
+# models.py describe (same fields, order and nulls). The pydantic models stay
+# the OpenAPI schema and validate requests; handlers encode these instead.
+
+
+# ============================================================================
+# Source Structs
+# ============================================================================
+
+class SourceBase(msgspec.Struct, kw_only=True):
+    """Base source information."""
+    domain: str
+    name: str
+    political_lean: Optional[int] = None
+    political_lean_label: Optional[str] = None
+    newsguard_score: Optional[float] = None
+    newsguard_rating: Optional[str] = None
+    source_type: Optional[str] = None
+    description: Optional[str] = None
+
+
+class SourceDetailed(SourceBase, kw_only=True):
+    """Detailed source information including criteria."""
+    ownership_summary: Optional[str] = None
+    criteria: Optional[dict] = None
+    created_at: Optional[str] = None
+
+
+class SourceWithScore(SourceBase, kw_only=True):
+    """Source with weighted scoring."""
+    weighted_score: Optional[float] = None
+
+
+# ============================================================================
+# Response Structs
+# ============================================================================
+
+class AnalyzeResponse(msgspec.Struct, kw_only=True):
+    """Response from analyze endpoint."""
+    url: str
+    domain: str
+    source: Optional[SourceDetailed] = None
+    source_found: bool
+    counternarratives: Optional[list[SourceWithScore]] = None
+    error: Optional[str] = None
+
+
+class BatchAnalyzeResponse(msgspec.Struct, kw_only=True):
+    """Response from batch analyze endpoint."""
+    results: list[AnalyzeResponse]
+    total: int
+    successful: int
+    failed: int
+
+
+class ScoringBreakdown(msgspec.Struct, kw_only=True):
+    """Breakdown of weighted scoring."""
+    credibility_score: float
+    bias_penalty: float = 0
+    type_bonus: float = 0
+    explanation: str
+
+
+class ScoreResponse(msgspec.Struct, kw_only=True):
+    """Response from score endpoint."""
+    source: Optional[SourceBase] = None
+    weighted_score: Optional[float] = None
+    scoring_breakdown: Optional[ScoringBreakdown] = None
+    recommendation: Optional[str] = None
+    error: Optional[str] = None
+
+
+class SourceListResponse(msgspec.Struct, kw_only=True):
+    """Response from source list endpoint."""
+    sources: list[SourceBase]
+    total: int
+    limit: int
+    offset: int
+    filters_applied: dict
+
+
+class CounternarrativeResponse(msgspec.Struct, kw_only=True):
+    """Response from counternarrative endpoint."""
+    source_domain: str
+    source_name: Optional[str] = None
+    source_lean: Optional[str] = None
+    counternarratives: list[SourceWithScore]
+    total: int
+
+
+class StatsResponse(msgspec.Struct, kw_only=True):
+    """Response from stats endpoint."""
+    total_sources: int
+    with_newsguard: int
+    with_political_lean: int
+    lean_distribution: dict[str, int]
+    type_distribution: dict[str, int]
+    credibility_tiers: dict[str, int]
+
+
+# ============================================================================
+# Usage Stats Structs
+# ============================================================================
+
+class ApiUsageBreakdown(msgspec.Struct, kw_only=True):
+    """Usage breakdown by API."""
+    api_name: str
+    calls: int
+    cost: float
+
+
+class ModelUsageBreakdown(msgspec.Struct, kw_only=True):
+    """Usage breakdown by model."""
+    model_used: str
+    calls: int
+    input_tokens: int
+    output_tokens: int
+    cost: float
+    avg_cost_per_call: float
+
+
+class DailyUsage(msgspec.Struct, kw_only=True):
+    """Daily usage summary."""
+    date: str
+    calls: int
+    input_tokens: int
+    output_tokens: int
+    cost: float
+
+
+class ExpensiveAnalysis(msgspec.Struct, kw_only=True):
+    """Info about an expensive analysis."""
+    url: str
+    model_used: Optional[str]
+    input_tokens: int
+    output_tokens: int
+    cost: float
+    timestamp: str
+
+
+class UsageTotals(msgspec.Struct, kw_only=True):
+    """Total usage metrics."""
+    total_calls: int
+    total_input_tokens: int
+    total_output_tokens: int
+    total_cost: float
+    successful_calls: int
+    failed_calls: int
+
+
+class UsageStatsResponse(msgspec.Struct, kw_only=True):
+    """Response from usage stats endpoint."""
+    period_days: int
+    totals: UsageTotals
+    by_api: list[ApiUsageBreakdown]
+    by_model: list[ModelUsageBreakdown]
+    daily: list[DailyUsage]
+    top_expensive: list[ExpensiveAnalysis]
+
+
+# ============================================================================
+# Encoding
+# ============================================================================
+
+_encoder = msgspec.json.Encoder()
+
+
+def convert(data: Any, type_: Any) -> Any:
+    """
+    Build a struct (or list of structs) from database dicts or model objects.
+
+    Unknown keys are ignored and missing optional fields take their defaults,
+    just as pydantic's response validation did.
+    """
+    return msgspec.convert(data, type_, from_attributes=True)
+
+
+def source_with_score(counter: CounterRow, weighted_score: float) -> SourceWithScore:
+    """
+    Build the scored struct for a counternarrative row.
+
+    Args:
+        counter: Counternarrative row from the database
+        weighted_score: Its context-weighted score
+
+    Returns:
+        SourceWithScore struct
+    """
+    # Direct construction skips convert()'s int -> float coercion, so floats
+    # are made explicit to keep encoding 100.0 rather than 100
+    return SourceWithScore(
+        domain=counter.domain,
+        name=counter.name,
+        political_lean=counter.political_lean,
+        political_lean_label=counter.political_lean_label,
+        newsguard_score=None if counter.newsguard_score is None else float(counter.newsguard_score),
+        source_type=counter.source_type,
+        description=counter.description,
+        weighted_score=float(weighted_score)
+    )
+
+
+def ndjson_line(obj: Any) -> bytes:
+    """Encode one struct as a newline-terminated JSON line."""
+    return _encoder.encode(obj) + b"\n"
+
+
+def json_response(obj: Any, status_code: int = 200) -> Response:
+    """
+    Encode a struct as a JSON response, bypassing FastAPI's response_model pass.
+
+    Already-built pydantic models are serialized by pydantic-core directly,
+    skipping the validate/jsonable_encoder round-trip FastAPI would apply.
+
+    Args:
+        obj: Struct, pydantic model (or other msgspec-encodable value)
+        status_code: HTTP status code
+
+    Returns:
+        Response with the encoded JSON body
+    """
+    if isinstance(obj, BaseModel):
+        content = obj.model_dump_json()
+    else:
+        content = _encoder.encode(obj)
+    return Response(
+        content=content,
+        media_type="application/json",
+        status_code=status_code
+    )
+
+
+def cacheable_json_response(obj: Any, request: Request, max_age: int = 60) -> Response:
+    """
+    Encode a struct as a JSON response with an ETag, answering 304 on a match.
+
+    The ETag is a hash of the encoded body, so it changes exactly when the
+    data does.
+
+    Args:
+        obj: Struct (or other msgspec-encodable value)
+        request: Incoming request, checked for If-None-Match
+        max_age: Seconds clients may reuse the response without revalidating
+
+    Returns:
+        304 Response if the client's copy is current, else the JSON response
+    """
+    content = _encoder.encode(obj)
+    etag = f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"max-age={max_age}"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak comparison (RFC 9110): ignore W/ prefixes
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=headers
+    )
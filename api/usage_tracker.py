@@ -1,12 +1,60 @@
 """API usage tracking and cost calculation."""
 
+import atexit
+import queue
 import sqlite3
+import threading
+import time
 from datetime import datetime
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
 
-from .config import settings
+import orjson
 
+from .config import settings
+from .database import get_db_connection
+
+# Usage rows are written through one persistent autocommit connection;
+# WAL with synchronous=NORMAL avoids an fsync per logged call
+WRITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Covering index for get_usage_stats' time-window aggregates (also in
+# data/usage_schema.sql; created here for databases built before it)
+WINDOW_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_api_usage_window ON api_usage_log(
+        timestamp, api_name, model_used, success,
+        input_tokens, output_tokens, estimated_cost_usd
+    )
+"""
+
+INSERT_SQL = """
+    INSERT INTO api_usage_log (
+        api_name,
+        endpoint,
+        model_used,
+        input_tokens,
+        output_tokens,
+        estimated_cost_usd,
+        url,
+        success,
+        error_message
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Entries are queued and batch-inserted by a background writer thread
+LOG_QUEUE_SIZE = 10_000
+LOG_BATCH_SIZE = 500
+LOG_BATCH_WINDOW = 0.005  # Seconds to wait for more entries before writing
+
+_log_queue: "queue.Queue[Optional[UsageLog]]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+_write_conn: Optional[sqlite3.Connection] = None
+_dropped = 0
 
 # Model pricing per million tokens (as of Dec 2024)
 # Source: https://openrouter.ai/models
@@ -54,6 +102,98 @@ MODEL_PRICING = {
 }
 
 
+# The full stats report as one JSON document. json() re-marks each scalar
+# subquery's result as JSON so it nests rather than embedding as a string.
+# The unary + keeps the planner from grouping via the api_name / model_used
+# indexes, which would scan every row instead of searching the window index.
+STATS_SQL = """
+    SELECT json_object(
+        'totals', json((
+            SELECT json_object(
+                'total_calls', COUNT(*),
+                'total_input_tokens', COALESCE(SUM(input_tokens), 0),
+                'total_output_tokens', COALESCE(SUM(output_tokens), 0),
+                'total_cost', COALESCE(SUM(estimated_cost_usd), 0.0),
+                'successful_calls', COALESCE(SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END), 0),
+                'failed_calls', COALESCE(SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END), 0)
+            )
+            FROM api_usage_log
+            WHERE timestamp >= datetime('now', ?1)
+        )),
+        'by_api', json((
+            SELECT json_group_array(json_object(
+                'api_name', api_name, 'calls', calls, 'cost', cost
+            ))
+            FROM (
+                SELECT
+                    api_name,
+                    COUNT(*) as calls,
+                    SUM(estimated_cost_usd) as cost
+                FROM api_usage_log
+                WHERE timestamp >= datetime('now', ?1)
+                GROUP BY +api_name
+                ORDER BY cost DESC
+            )
+        )),
+        'by_model', json((
+            SELECT json_group_array(json_object(
+                'model_used', model_used, 'calls', calls,
+                'input_tokens', input_tokens, 'output_tokens', output_tokens,
+                'cost', cost, 'avg_cost_per_call', avg_cost_per_call
+            ))
+            FROM (
+                SELECT
+                    model_used,
+                    COUNT(*) as calls,
+                    SUM(input_tokens) as input_tokens,
+                    SUM(output_tokens) as output_tokens,
+                    SUM(estimated_cost_usd) as cost,
+                    AVG(estimated_cost_usd) as avg_cost_per_call
+                FROM api_usage_log
+                WHERE timestamp >= datetime('now', ?1)
+                    AND +model_used IS NOT NULL
+                GROUP BY +model_used
+                ORDER BY cost DESC
+            )
+        )),
+        'daily', json((
+            SELECT json_group_array(json_object(
+                'date', date, 'calls', calls,
+                'input_tokens', input_tokens, 'output_tokens', output_tokens,
+                'cost', cost
+            ))
+            FROM (
+                SELECT
+                    DATE(timestamp) as date,
+                    COUNT(*) as calls,
+                    SUM(input_tokens) as input_tokens,
+                    SUM(output_tokens) as output_tokens,
+                    SUM(estimated_cost_usd) as cost
+                FROM api_usage_log
+                WHERE timestamp >= datetime('now', ?1)
+                GROUP BY DATE(timestamp)
+                ORDER BY date DESC
+            )
+        )),
+        'top_expensive', json((
+            SELECT json_group_array(json_object(
+                'url', url, 'model_used', model_used,
+                'input_tokens', input_tokens, 'output_tokens', output_tokens,
+                'cost', estimated_cost_usd, 'timestamp', timestamp
+            ))
+            FROM (
+                SELECT url, model_used, input_tokens, output_tokens, estimated_cost_usd, timestamp
+                FROM api_usage_log
+                WHERE timestamp >= datetime('now', ?1)
+                    AND estimated_cost_usd > 0
+                ORDER BY estimated_cost_usd DESC
+                LIMIT 10
+            )
+        ))
+    )
+"""
+
+
 @dataclass
 class UsageLog:
     """API usage log entry."""
@@ -68,6 +208,13 @@ class UsageLog:
     error_message: Optional[str] = None
 
 
+# (input, output) USD per token, derived once from the per-1M prices
+_PRICING_PER_TOKEN: dict[str, tuple[float, float]] = {
+    model: (pricing["input"] / 1_000_000, pricing["output"] / 1_000_000)
+    for model, pricing in MODEL_PRICING.items()
+}
+
+
 def calculate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
     """
     Calculate estimated cost for an API call.
@@ -80,161 +227,150 @@ def calculate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
     Returns:
         Estimated cost in USD
     """
-    if model not in MODEL_PRICING:
+    pricing = _PRICING_PER_TOKEN.get(model)
+    if pricing is None:
         # Unknown model, use conservative estimate
         return 0.0
 
-    pricing = MODEL_PRICING[model]
-    input_cost = (input_tokens / 1_000_000) * pricing["input"]
-    output_cost = (output_tokens / 1_000_000) * pricing["output"]
+    input_cost = input_tokens * pricing[0]
+    output_cost = output_tokens * pricing[1]
 
     return round(input_cost + output_cost, 6)
 
 
+def _get_write_conn() -> sqlite3.Connection:
+    """Open the usage-log write connection on first use (writer thread only)."""
+    global _write_conn
+    if _write_conn is None:
+        conn = sqlite3.connect(settings.db_path, isolation_level=None, check_same_thread=False)
+        try:
+            for pragma in WRITE_PRAGMAS:
+                conn.execute(pragma)
+            conn.execute(WINDOW_INDEX_SQL)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        _write_conn = conn
+    return _write_conn
+
+
+def _write_batch(batch: list[UsageLog]) -> None:
+    """Insert a batch of entries in one transaction."""
+    global _write_conn
+    try:
+        conn = _get_write_conn()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(INSERT_SQL, [astuple(log) for log in batch])
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+    except Exception as e:
+        # Don't let logging failures break the API; reopen on the next batch
+        print(f"Failed to log API usage ({len(batch)} entries): {e}")
+        if _write_conn is not None:
+            _write_conn.close()
+            _write_conn = None
+
+
+def _writer_loop() -> None:
+    """Drain the queue in batches until a None sentinel arrives."""
+    stopping = False
+    while not stopping:
+        entry = _log_queue.get()
+        if entry is None:
+            break
+
+        # Collect whatever else arrives within the batch window
+        batch = [entry]
+        deadline = time.monotonic() + LOG_BATCH_WINDOW
+        while len(batch) < LOG_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                entry = _log_queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if entry is None:
+                stopping = True
+                break
+            batch.append(entry)
+
+        _write_batch(batch)
+
+
+def _ensure_writer() -> None:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_writer_loop, name="usage-log-writer", daemon=True)
+                _writer.start()
+
+
+def close_usage_connection() -> None:
+    """
+    Flush queued entries, stop the writer and close its connection.
+
+    Called on application shutdown (and at interpreter exit); logging after
+    this starts a new writer.
+    """
+    global _writer, _write_conn
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        _log_queue.put(None)
+        writer.join()
+    if _write_conn is not None:
+        try:
+            # Refresh planner statistics for the indexes after bulk inserts
+            _write_conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
+        _write_conn.close()
+        _write_conn = None
+    if _dropped:
+        print(f"Dropped {_dropped} API usage entries (log queue full)")
+
+
+atexit.register(close_usage_connection)
+
+
 def log_api_usage(log: UsageLog) -> None:
     """
-    Log an API usage entry to the database.
+    Queue an API usage entry to be written to the database.
+
+    Never blocks: entries are batch-inserted by a background thread, and
+    dropped (and counted) if the queue is full.
 
     Args:
         log: UsageLog entry to store
     """
+    global _dropped
+    _ensure_writer()
     try:
-        conn = sqlite3.connect(settings.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO api_usage_log (
-                api_name,
-                endpoint,
-                model_used,
-                input_tokens,
-                output_tokens,
-                estimated_cost_usd,
-                url,
-                success,
-                error_message
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            log.api_name,
-            log.endpoint,
-            log.model_used,
-            log.input_tokens,
-            log.output_tokens,
-            log.estimated_cost_usd,
-            log.url,
-            log.success,
-            log.error_message
-        ))
-
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        # Don't let logging failures break the API
-        print(f"Failed to log API usage: {e}")
+        _log_queue.put_nowait(log)
+    except queue.Full:
+        _dropped += 1
 
 
 def get_usage_stats(days: int = 30) -> dict:
     """
     Get API usage statistics for the last N days.
 
+    One statement builds the whole report as JSON inside SQLite, so every
+    section sees the same snapshot and window cutoff ('now' is fixed for
+    the duration of a statement).
+
     Args:
         days: Number of days to include (default 30)
 
     Returns:
         Dictionary with usage statistics
     """
-    conn = sqlite3.connect(settings.db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    # Total stats
-    cursor.execute("""
-        SELECT
-            COUNT(*) as total_calls,
-            SUM(input_tokens) as total_input_tokens,
-            SUM(output_tokens) as total_output_tokens,
-            SUM(estimated_cost_usd) as total_cost,
-            SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful_calls,
-            SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as failed_calls
-        FROM api_usage_log
-        WHERE timestamp >= datetime('now', ? || ' days')
-    """, (f"-{days}",))
-
-    totals = dict(cursor.fetchone())
-
-    # By API
-    cursor.execute("""
-        SELECT
-            api_name,
-            COUNT(*) as calls,
-            SUM(estimated_cost_usd) as cost
-        FROM api_usage_log
-        WHERE timestamp >= datetime('now', ? || ' days')
-        GROUP BY api_name
-        ORDER BY cost DESC
-    """, (f"-{days}",))
-
-    by_api = [dict(row) for row in cursor.fetchall()]
-
-    # By model
-    cursor.execute("""
-        SELECT
-            model_used,
-            COUNT(*) as calls,
-            SUM(input_tokens) as input_tokens,
-            SUM(output_tokens) as output_tokens,
-            SUM(estimated_cost_usd) as cost,
-            AVG(estimated_cost_usd) as avg_cost_per_call
-        FROM api_usage_log
-        WHERE timestamp >= datetime('now', ? || ' days')
-            AND model_used IS NOT NULL
-        GROUP BY model_used
-        ORDER BY cost DESC
-    """, (f"-{days}",))
-
-    by_model = [dict(row) for row in cursor.fetchall()]
-
-    # Daily breakdown
-    cursor.execute("""
-        SELECT
-            DATE(timestamp) as date,
-            COUNT(*) as calls,
-            SUM(input_tokens) as input_tokens,
-            SUM(output_tokens) as output_tokens,
-            SUM(estimated_cost_usd) as cost
-        FROM api_usage_log
-        WHERE timestamp >= datetime('now', ? || ' days')
-        GROUP BY DATE(timestamp)
-        ORDER BY date DESC
-    """, (f"-{days}",))
-
-    daily = [dict(row) for row in cursor.fetchall()]
-
-    # Most expensive analyses
-    cursor.execute("""
-        SELECT
-            url,
-            model_used,
-            input_tokens,
-            output_tokens,
-            estimated_cost_usd as cost,
-            timestamp
-        FROM api_usage_log
-        WHERE timestamp >= datetime('now', ? || ' days')
-            AND estimated_cost_usd > 0
-        ORDER BY estimated_cost_usd DESC
-        LIMIT 10
-    """, (f"-{days}",))
-
-    top_expensive = [dict(row) for row in cursor.fetchall()]
-
-    conn.close()
-
-    return {
-        "period_days": days,
-        "totals": totals,
-        "by_api": by_api,
-        "by_model": by_model,
-        "daily": daily,
-        "top_expensive": top_expensive
-    }
+    with get_db_connection() as conn:
+        report = conn.execute(STATS_SQL, (f"-{days} days",)).fetchone()[0]
+
+    return {"period_days": days, **orjson.loads(report)}
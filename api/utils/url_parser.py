@@ -1,8 +1,45 @@
 """URL parsing utilities for extracting domains from article URLs."""
 
-import tldextract
+import re
+from functools import lru_cache
 from urllib.parse import urlparse
 
+import tldextract
+
+# Parse with the public suffix list bundled with tldextract rather than
+# fetching it over the network on first use. With no cache_dir there is no
+# JSON cache file (or its lock) to touch, and loading the snapshot here keeps
+# that one-off cost out of the first request.
+_extract = tldextract.TLDExtract(
+    cache_dir=None,
+    suffix_list_urls=(),
+    include_psl_private_domains=False
+)
+_extract.update(fetch_now=True)
+
+# Domains recur heavily across requests, so parsed results are memoized
+URL_CACHE_SIZE = 16384
+
+# The network location ends at the first path, query or fragment delimiter
+_NETLOC_END = re.compile(r"[/?#]")
+
+# Shape of anything worth handing to tldextract: optional http(s) scheme and
+# userinfo, dot-separated host labels (IDN allowed), optional port and path
+_URL_RE = re.compile(
+    r"(?:https?://)?(?:[^\s/?#@]+@)?[\w-]+(?:\.[\w-]+)+\.?(?::\d+)?(?:[/?#].*)?",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _registered_domain(netloc: str) -> str:
+    # Keyed on the network location alone: every article URL on a host
+    # shares one entry, and the path never affects the result. A bare host
+    # goes to tldextract as-is; one with a colon (port, userinfo) gets a
+    # scheme so the part before the colon isn't mistaken for one.
+    extracted = _extract(f"https://{netloc}" if ":" in netloc else netloc)
+    return f"{extracted.domain}.{extracted.suffix}"
+
 
 def extract_domain(url: str) -> str:
     """
@@ -28,20 +65,82 @@ def extract_domain(url: str) -> str:
         >>> extract_domain("nytimes.com")
         'nytimes.com'
     """
-    # Add scheme if missing (required for urlparse)
+    # Strip the scheme, if any, and everything after the host
+    if url.startswith(("http://", "https://")):
+        url = url.partition("://")[2]
+    netloc = _NETLOC_END.split(url, maxsplit=1)[0]
+
+    # Reconstruct as domain.suffix (e.g., nytimes.com); tldextract handles
+    # subdomains, ports and multi-part suffixes
+    return _registered_domain(netloc)
+
+
+def normalize_domain(url_or_host: str) -> str:
+    """
+    Reduce a URL or host to its bare lowercase hostname.
+
+    Strips scheme, port, path, and a leading "www.".
+
+    Args:
+        url_or_host: URL or domain string
+
+    Returns:
+        Hostname (e.g., "edition.cnn.com")
+
+    Examples:
+        >>> normalize_domain("https://www.NYTimes.com/2024/article")
+        'nytimes.com'
+        >>> normalize_domain("edition.cnn.com/world")
+        'edition.cnn.com'
+    """
+    url = url_or_host.strip()
     if not url.startswith(("http://", "https://")):
         url = f"https://{url}"
 
-    # Extract components using tldextract
-    # This handles subdomains, domain, and suffix properly
-    extracted = tldextract.extract(url)
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except ValueError:
+        # Malformed netloc (e.g. an unclosed "[" IPv6 bracket): keep the raw
+        # host text, which simply matches no stored domain
+        host = _NETLOC_END.split(url.partition("://")[2], maxsplit=1)[0].lower()
+    return host.removeprefix("www.")
+
+
+def domain_candidates(url_or_host: str) -> list[str]:
+    """
+    List the domains a URL could be stored under, most specific first.
 
-    # Reconstruct as domain.suffix (e.g., nytimes.com)
-    domain = f"{extracted.domain}.{extracted.suffix}"
+    Walks from the full hostname down to the registered domain, so exact
+    lookups can match both subdomain entries (news.yahoo.com) and apex
+    entries (cnn.com) without a wildcard scan.
 
-    return domain
+    Args:
+        url_or_host: URL or domain string
 
+    Returns:
+        Candidate domains
 
+    Examples:
+        >>> domain_candidates("https://edition.cnn.com/world")
+        ['edition.cnn.com', 'cnn.com']
+        >>> domain_candidates("nytimes.com")
+        ['nytimes.com']
+    """
+    host = normalize_domain(url_or_host)
+    registered = extract_domain(host)
+
+    parts = host.split(".")
+    candidates = []
+    for i in range(len(parts)):
+        candidate = ".".join(parts[i:])
+        candidates.append(candidate)
+        if candidate == registered:
+            break
+
+    return candidates
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def is_valid_url(url: str) -> bool:
     """
     Check if string is a valid URL or domain.
@@ -52,6 +151,10 @@ def is_valid_url(url: str) -> bool:
     Returns:
         True if valid URL/domain, False otherwise
     """
+    # Reject junk (spaces in the host, no dot, empty labels) without a PSL lookup
+    if not _URL_RE.fullmatch(url.strip()):
+        return False
+
     try:
         # Try to extract domain
         domain = extract_domain(url)
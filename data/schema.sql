@@ -40,24 +40,30 @@ CREATE TABLE IF NOT EXISTS sources (
 
 -- Index for common queries
 CREATE INDEX IF NOT EXISTS idx_political_lean ON sources(political_lean);
-CREATE INDEX IF NOT EXISTS idx_newsguard_score ON sources(newsguard_score);
 CREATE INDEX IF NOT EXISTS idx_source_type ON sources(source_type);
 
--- View for finding counternarrative sources
-CREATE VIEW IF NOT EXISTS counternarrative_pairs AS
-SELECT
-    s1.domain as source_domain,
-    s1.name as source_name,
-    s1.political_lean as source_lean,
-    s1.newsguard_score as source_credibility,
-    s2.domain as counter_domain,
-    s2.name as counter_name,
-    s2.political_lean as counter_lean,
-    s2.newsguard_score as counter_credibility
-FROM sources s1
-CROSS JOIN sources s2
-WHERE s1.political_lean != 0
-  AND s2.political_lean != 0
-  AND s1.political_lean * s2.political_lean < 0  -- opposite sides
-  AND s2.newsguard_score >= 60  -- minimum credibility threshold
-ORDER BY s1.domain, s2.newsguard_score DESC;
+-- Covering index for credibility listings sorted by score
+CREATE INDEX IF NOT EXISTS idx_sources_score_cover ON sources(
+    newsguard_score DESC, political_lean, domain, name, political_lean_label, source_type
+);
+
+-- Composite indexes for filtered queries sorted by credibility
+CREATE INDEX IF NOT EXISTS idx_sources_lean_score ON sources(political_lean, newsguard_score DESC);
+CREATE INDEX IF NOT EXISTS idx_sources_type_score ON sources(source_type, newsguard_score DESC);
+
+-- Counternarrative sources, materialized by scripts/build_database.py
+-- (create_counternarrative_pairs); rebuilt after every import
+CREATE TABLE IF NOT EXISTS counternarrative_pairs (
+    source_domain TEXT,
+    source_name TEXT,
+    source_lean INTEGER,
+    source_lean_label TEXT,
+    source_credibility REAL,
+    counter_domain TEXT,
+    counter_name TEXT,
+    counter_lean INTEGER,
+    counter_lean_label TEXT,
+    counter_credibility REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_cnp_source ON counternarrative_pairs(source_domain, counter_credibility DESC);
@@ -31,3 +31,9 @@ CREATE INDEX IF NOT EXISTS idx_api_usage_timestamp ON api_usage_log(timestamp);
 CREATE INDEX IF NOT EXISTS idx_api_usage_api_name ON api_usage_log(api_name);
 CREATE INDEX IF NOT EXISTS idx_api_usage_model ON api_usage_log(model_used);
 CREATE INDEX IF NOT EXISTS idx_api_usage_success ON api_usage_log(success);
+
+-- Covers the time-window aggregates in get_usage_stats
+CREATE INDEX IF NOT EXISTS idx_api_usage_window ON api_usage_log(
+    timestamp, api_name, model_used, success,
+    input_tokens, output_tokens, estimated_cost_usd
+);
@@ -3,48 +3,78 @@
 Build the unified SourceInfo SQLite database from NewsGuard and AllSides data.
 """
 
-import json
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 
+import orjson
+
+# Stream large input files if ijson is available (bounded memory); otherwise
+# parse each file whole
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def iter_json_items(filepath: str, key: str):
+    """Yield the records of the top-level `key` array in a JSON file."""
+    with open(filepath, "rb") as f:
+        if ijson is not None:
+            yield from ijson.items(f, f"{key}.item", use_float=True)
+        else:
+            yield from orjson.loads(f.read())[key]
+
+
+def iter_json_sections(filepath: str):
+    """Yield (key, value) for each top-level member of a JSON object file."""
+    with open(filepath, "rb") as f:
+        if ijson is not None:
+            yield from ijson.kvitems(f, "", use_float=True)
+        else:
+            yield from orjson.loads(f.read()).items()
+
+
+# AllSides lean labels
+_LEAN_LABELS = {-2: "Left", -1: "Lean Left", 0: "Center", 1: "Lean Right", 2: "Right"}
+
+
+def _entry_rank(name: str) -> int:
+    """Precedence of an AllSides entry among a domain's variants (lower wins)."""
+    if "Opinion" in name:
+        return 2
+    if "Fact Check" in name:
+        return 1
+    return 0
+
 
 def load_newsguard_data(filepath: str) -> dict:
     """Load NewsGuard extracted data."""
-    with open(filepath) as f:
-        data = json.load(f)
     # Convert to dict keyed by domain
-    return {s["domain"]: s for s in data["sources"]}
+    return {s["domain"]: s for s in iter_json_items(filepath, "sources")}
 
 
 def load_allsides_data(filepath: str) -> dict:
     """Load AllSides ratings data."""
-    with open(filepath) as f:
-        data = json.load(f)
-
     # Convert to dict keyed by domain
-    # Handle multiple entries per domain (news vs opinion) by taking primary
+    # Handle multiple entries per domain (news, fact check, opinion) by
+    # keeping the most primary one; the first entry wins among equals
     result = {}
-    for entry in data["ratings"]:
+    ranks = {}
+    for entry in iter_json_items(filepath, "ratings"):
         domain = entry.get("domain")
         if not domain:
             continue
 
-        # If domain already exists, prefer News over Opinion entries
-        if domain in result:
-            if "Opinion" in entry.get("name", ""):
-                continue  # Skip opinion variants if we have news
+        rank = _entry_rank(entry.get("name", ""))
+        if domain in ranks and ranks[domain] <= rank:
+            continue
+        ranks[domain] = rank
 
         result[domain] = {
             "name": entry["name"],
             "political_lean": entry["lean"],
-            "political_lean_label": {
-                -2: "Left",
-                -1: "Lean Left",
-                0: "Center",
-                1: "Lean Right",
-                2: "Right"
-            }.get(entry["lean"], "Unknown"),
+            "political_lean_label": _LEAN_LABELS.get(entry["lean"], "Unknown"),
             "source_type": entry.get("type", "News Media").lower().replace(" ", "_").replace("/", "_")
         }
 
@@ -87,9 +117,22 @@ def create_database(db_path: str, newsguard_data: dict, allsides_data: dict):
 
     # Create indexes
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_political_lean ON sources(political_lean)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_newsguard_score ON sources(newsguard_score)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_source_type ON sources(source_type)")
 
+    # Score-ordered covering index: credibility listings read it in order
+    # without a sort or table lookups. It replaces the plain score index,
+    # which the planner would otherwise keep choosing on older databases.
+    cursor.execute("DROP INDEX IF EXISTS idx_newsguard_score")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sources_score_cover ON sources("
+        "newsguard_score DESC, political_lean, domain, name, political_lean_label, source_type)"
+    )
+
+    # Composite indexes so filtered "ORDER BY newsguard_score DESC LIMIT n"
+    # queries walk the index in order instead of scanning and sorting
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sources_lean_score ON sources(political_lean, newsguard_score DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sources_type_score ON sources(source_type, newsguard_score DESC)")
+
     # Get all unique domains from both sources
     all_domains = set(newsguard_data.keys()) | set(allsides_data.keys())
 
@@ -97,7 +140,8 @@ def create_database(db_path: str, newsguard_data: dict, allsides_data: dict):
     print(f"AllSides sources: {len(allsides_data)}")
     print(f"Total unique domains: {len(all_domains)}")
 
-    # Insert/merge data
+    # Merge rows, then insert them in one statement within one transaction
+    rows = []
     for domain in sorted(all_domains):
         ng = newsguard_data.get(domain, {})
         als = allsides_data.get(domain, {})
@@ -105,18 +149,12 @@ def create_database(db_path: str, newsguard_data: dict, allsides_data: dict):
         # Determine name - prefer AllSides name as it's cleaner
         name = als.get("name") or ng.get("name") or domain
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO sources (
-                domain, name, newsguard_score, newsguard_rating,
-                criteria_json, political_lean, political_lean_label,
-                source_type, description, ownership_summary
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        rows.append((
             domain,
             name,
             ng.get("newsguard_score"),
             ng.get("newsguard_rating"),
-            json.dumps(ng.get("criteria")) if ng.get("criteria") else None,
+            orjson.dumps(ng["criteria"]).decode() if ng.get("criteria") else None,
             als.get("political_lean"),
             als.get("political_lean_label"),
             als.get("source_type") or ng.get("source_type") or "news_media",
@@ -124,6 +162,16 @@ def create_database(db_path: str, newsguard_data: dict, allsides_data: dict):
             ng.get("ownership_summary")
         ))
 
+    cursor.executemany("""
+        INSERT OR REPLACE INTO sources (
+            domain, name, newsguard_score, newsguard_rating,
+            criteria_json, political_lean, political_lean_label,
+            source_type, description, ownership_summary
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+
+    # Refresh planner statistics so the composite indexes get picked
+    cursor.execute("ANALYZE")
     conn.commit()
 
     # Print summary
@@ -161,15 +209,25 @@ def create_database(db_path: str, newsguard_data: dict, allsides_data: dict):
     return total
 
 
-def create_counternarrative_view(db_path: str):
-    """Create a view for finding counternarrative sources."""
+def create_counternarrative_pairs(db_path: str):
+    """
+    Materialize the counternarrative_pairs table from the sources table.
+
+    Rebuild it whenever sources change (build or import). Older databases
+    have this as a view over a full cross join; it is replaced.
+    """
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
-    # Drop and recreate view
-    cursor.execute("DROP VIEW IF EXISTS counternarrative_pairs")
+    cursor.execute("SELECT type FROM sqlite_master WHERE name = 'counternarrative_pairs'")
+    existing = cursor.fetchone()
+    if existing:
+        cursor.execute(f"DROP {existing[0].upper()} counternarrative_pairs")
+
+    # Pair each side only with the other side, so both halves of the join
+    # are range scans on idx_political_lean instead of an N^2 cross product
     cursor.execute("""
-        CREATE VIEW counternarrative_pairs AS
+        CREATE TABLE counternarrative_pairs AS
         SELECT
             s1.domain as source_domain,
             s1.name as source_name,
@@ -182,20 +240,21 @@ def create_counternarrative_view(db_path: str):
             s2.political_lean_label as counter_lean_label,
             s2.newsguard_score as counter_credibility
         FROM sources s1
-        CROSS JOIN sources s2
-        WHERE s1.political_lean IS NOT NULL
-          AND s2.political_lean IS NOT NULL
-          AND s1.political_lean != 0
-          AND s2.political_lean != 0
-          AND s1.political_lean * s2.political_lean < 0  -- opposite sides
-          AND s2.newsguard_score >= 60  -- minimum credibility threshold
+        JOIN sources s2
+          ON (s1.political_lean < 0 AND s2.political_lean > 0)
+          OR (s1.political_lean > 0 AND s2.political_lean < 0)
+        WHERE s2.newsguard_score >= 60  -- minimum credibility threshold
         ORDER BY s1.domain, s2.newsguard_score DESC
     """)
+    cursor.execute("""
+        CREATE INDEX idx_cnp_source
+        ON counternarrative_pairs(source_domain, counter_credibility DESC)
+    """)
 
     conn.commit()
 
-    # Test the view
-    print("\nCounternarrative view created. Sample queries:")
+    # Test the table
+    print("\nCounternarrative pairs created. Sample queries:")
 
     cursor.execute("""
         SELECT source_domain, source_lean_label, counter_domain, counter_lean_label, counter_credibility
@@ -231,5 +290,5 @@ if __name__ == "__main__":
     db_path = base_dir / "data" / "sources.db"
     create_database(str(db_path), newsguard, allsides)
 
-    # Create counternarrative view
-    create_counternarrative_view(str(db_path))
+    # Materialize counternarrative pairs
+    create_counternarrative_pairs(str(db_path))
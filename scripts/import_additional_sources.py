@@ -3,11 +3,14 @@
 Import additional sources from research into the SourceInfo database.
 """
 
-import json
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 
+import orjson
+
+from build_database import create_counternarrative_pairs
+
 
 DB_PATH = Path("/home/mmariani/Projects/SourceInfo/data/sources.db")
 SOURCES_PATH = Path("/home/mmariani/Projects/SourceInfo/data/additional_sources_from_research.json")
@@ -49,8 +52,8 @@ def import_sources():
     """Import all sources into the database."""
 
     # Load sources
-    with open(SOURCES_PATH) as f:
-        data = json.load(f)
+    with open(SOURCES_PATH, "rb") as f:
+        data = orjson.loads(f.read())
 
     # Connect to database
     conn = sqlite3.connect(DB_PATH)
@@ -63,6 +66,14 @@ def import_sources():
         "by_category": {},
     }
 
+    # Existing domains are skipped; new rows are inserted in one batch
+    cursor.execute("SELECT domain FROM sources")
+    existing_domains = {row[0] for row in cursor.fetchall()}
+    rows = []
+
+    # One import, one timestamp for every row it adds
+    imported_at = datetime.now().isoformat()
+
     # Process each category
     for category, sources in data.items():
         category_name = category.replace("_", " ").title()
@@ -85,10 +96,7 @@ def import_sources():
             source_type = determine_source_type(category, description, notes)
 
             # Check if source already exists
-            cursor.execute("SELECT domain FROM sources WHERE domain = ?", (domain,))
-            existing = cursor.fetchone()
-
-            if existing:
+            if domain in existing_domains:
                 print(f"  SKIP (exists): {domain}")
                 stats["skipped"] += 1
                 stats["total"] += 1
@@ -101,20 +109,16 @@ def import_sources():
             if notes:
                 full_description = f"{full_description} | {notes}"
 
-            # Insert new source
-            cursor.execute("""
-                INSERT INTO sources (
-                    domain, name, political_lean, political_lean_label,
-                    source_type, description, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
+            # Queue new source
+            existing_domains.add(domain)
+            rows.append((
                 domain,
                 name,
                 political_lean,
                 political_lean_label,
                 source_type,
                 full_description,
-                datetime.now().isoformat()
+                imported_at
             ))
 
             lean_str = political_lean_label or "N/A"
@@ -123,9 +127,18 @@ def import_sources():
             stats["total"] += 1
             stats["by_category"][category_name] += 1
 
+    cursor.executemany("""
+        INSERT INTO sources (
+            domain, name, political_lean, political_lean_label,
+            source_type, description, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, rows)
     conn.commit()
     conn.close()
 
+    # New sources change the pairs; rebuild the materialized table
+    create_counternarrative_pairs(str(DB_PATH))
+
     # Print summary
     print("\n" + "=" * 60)
     print("IMPORT SUMMARY")
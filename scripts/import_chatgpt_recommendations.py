@@ -4,15 +4,53 @@ Import ChatGPT recommendations into the SourceInfo database.
 Maps estimated_lean to our political_lean integer scale.
 """
 
-import json
 import sqlite3
+import sys
 from pathlib import Path
 from datetime import datetime
 
+from build_database import create_counternarrative_pairs, iter_json_sections
+
 
 DB_PATH = Path("/home/mmariani/Projects/SourceInfo/data/sources.db")
 RECOMMENDATIONS_PATH = Path("/home/mmariani/Projects/SourceInfo/data/chatgpt_recommendations.json")
 
+INSERT_SQL = """
+    INSERT INTO sources (
+        domain, name, political_lean, political_lean_label,
+        source_type, description, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Pending rows are flushed in batches of this size (all in one transaction)
+INSERT_BATCH_SIZE = 1000
+
+
+# ChatGPT estimated_lean -> (political_lean_int, political_lean_label)
+LEAN_MAPPING = {
+    "Left": (-2, "Left"),
+    "Lean Left": (-1, "Lean Left"),
+    "Center-Left": (-1, "Lean Left"),
+    "Center": (0, "Center"),
+    "Center-Right": (1, "Lean Right"),
+    "Lean Right": (1, "Lean Right"),
+    "Right": (2, "Right"),
+    "Libertarian": (0, "Center"),  # Treating as center for now
+    "Center-Right (Anti-Trump)": (1, "Lean Right"),
+    "N/A": (None, None),
+}
+
+# Recommendation category -> source_type, unless the notes say otherwise
+TYPE_MAPPING = {
+    "international": "news_media",
+    "technology": "news_media",
+    "business": "news_media",
+    "science_health": "news_media",
+    "entertainment": "news_media",
+    "sports": "news_media",
+    "alternative_independent": "news_media",
+}
+
 
 def map_lean_to_integer(estimated_lean: str) -> tuple[int | None, str | None]:
     """
@@ -20,55 +58,29 @@ def map_lean_to_integer(estimated_lean: str) -> tuple[int | None, str | None]:
 
     Returns: (political_lean_int, political_lean_label)
     """
-    # Mapping dictionary
-    lean_mapping = {
-        "Left": (-2, "Left"),
-        "Lean Left": (-1, "Lean Left"),
-        "Center-Left": (-1, "Lean Left"),
-        "Center": (0, "Center"),
-        "Center-Right": (1, "Lean Right"),
-        "Lean Right": (1, "Lean Right"),
-        "Right": (2, "Right"),
-        "Libertarian": (0, "Center"),  # Treating as center for now
-        "Center-Right (Anti-Trump)": (1, "Lean Right"),
-        "N/A": (None, None),
-    }
-
-    return lean_mapping.get(estimated_lean, (None, None))
+    return LEAN_MAPPING.get(estimated_lean, (None, None))
 
 
 def determine_source_type(category: str, notes: str = "") -> str:
     """Determine source_type based on category and notes."""
-    type_mapping = {
-        "international": "news_media",
-        "technology": "news_media",
-        "business": "news_media",
-        "science_health": "news_media",
-        "entertainment": "news_media",
-        "sports": "news_media",
-        "alternative_independent": "news_media",
-    }
+    notes = notes.lower()
 
     # Special cases
-    if "fact" in notes.lower() or "factcheck" in notes.lower():
+    if "fact" in notes or "factcheck" in notes:
         return "fact_check"
-    if "think tank" in notes.lower():
+    if "think tank" in notes:
         return "think_tank"
-    if "newsletter" in notes.lower() or "substack" in notes.lower():
+    if "newsletter" in notes or "substack" in notes:
         return "author"
-    if "wire service" in notes.lower() or "wire-service" in notes.lower():
+    if "wire service" in notes or "wire-service" in notes:
         return "wire_service"
 
-    return type_mapping.get(category, "news_media")
+    return TYPE_MAPPING.get(category, "news_media")
 
 
 def import_recommendations():
     """Import all recommendations into the database."""
 
-    # Load recommendations
-    with open(RECOMMENDATIONS_PATH) as f:
-        data = json.load(f)
-
     # Connect to database
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
@@ -81,8 +93,16 @@ def import_recommendations():
         "by_category": {},
     }
 
-    # Process each category
-    for category, sources in data.items():
+    # Existing domains are skipped; new rows are inserted in batches
+    cursor.execute("SELECT domain FROM sources")
+    existing_domains = {row[0] for row in cursor.fetchall()}
+    rows = []
+
+    # One import, one timestamp for every row it adds
+    imported_at = datetime.now().isoformat()
+
+    # Process each category as it is read from the file
+    for category, sources in iter_json_sections(RECOMMENDATIONS_PATH):
         stats["by_category"][category] = 0
 
         for source in sources:
@@ -99,10 +119,7 @@ def import_recommendations():
             source_type = determine_source_type(category, notes)
 
             # Check if source already exists
-            cursor.execute("SELECT domain, name FROM sources WHERE domain = ?", (domain,))
-            existing = cursor.fetchone()
-
-            if existing:
+            if domain in existing_domains:
                 # Update only if we have new information
                 # For now, skip if already exists to preserve NewsGuard data
                 print(f"  SKIP (exists): {domain} - {name}")
@@ -117,29 +134,31 @@ def import_recommendations():
             if notes:
                 full_description = f"{full_description} | {notes}"
 
-            # Insert new source
-            cursor.execute("""
-                INSERT INTO sources (
-                    domain, name, political_lean, political_lean_label,
-                    source_type, description, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
+            # Queue new source
+            existing_domains.add(domain)
+            rows.append((
                 domain,
                 name,
                 political_lean,
                 political_lean_label,
                 source_type,
                 full_description,
-                datetime.now().isoformat()
+                imported_at
             ))
+            if len(rows) >= INSERT_BATCH_SIZE:
+                cursor.executemany(INSERT_SQL, rows)
+                rows.clear()
 
             print(f"  ADD: {domain} - {name} ({political_lean_label or 'N/A'}, {source_type})")
             stats["new"] += 1
             stats["total"] += 1
             stats["by_category"][category] += 1
 
+    cursor.executemany(INSERT_SQL, rows)
     conn.commit()
-    conn.close()
+
+    # New sources change the pairs; rebuild the materialized table
+    create_counternarrative_pairs(str(DB_PATH))
 
     # Print summary
     print("\n" + "=" * 60)
@@ -153,18 +172,9 @@ def import_recommendations():
     for category, count in stats["by_category"].items():
         print(f"  {category}: {count} new")
 
-    # Show updated database stats
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT COUNT(*) FROM sources")
-    total = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM sources WHERE newsguard_score IS NOT NULL")
-    with_ng = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM sources WHERE political_lean IS NOT NULL")
-    with_lean = cursor.fetchone()[0]
+    # Show updated database stats (COUNT(col) skips NULLs: one pass for all three)
+    cursor.execute("SELECT COUNT(*), COUNT(newsguard_score), COUNT(political_lean) FROM sources")
+    total, with_ng, with_lean = cursor.fetchone()
 
     cursor.execute("SELECT political_lean_label, COUNT(*) FROM sources WHERE political_lean IS NOT NULL GROUP BY political_lean_label ORDER BY political_lean")
     lean_dist = cursor.fetchall()
@@ -183,6 +193,9 @@ def import_recommendations():
 
 
 if __name__ == "__main__":
+    # One line per source would otherwise be one write per line on a terminal
+    sys.stdout.reconfigure(line_buffering=False)
+
     print("Importing ChatGPT recommendations into SourceInfo database...")
     print("=" * 60)
     import_recommendations()
@@ -3,47 +3,82 @@
 Parse NewsGuard PDF "Nutrition Labels" and extract structured data.
 """
 
+import multiprocessing
 import os
 import re
-import json
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 
-# Try to import PDF parsing libraries
+import orjson
+
+# Try to import PDF parsing libraries, fastest first: pypdfium2 binds the
+# native PDFium engine; pdfplumber and pypdf extract in pure Python
 try:
-    import pdfplumber
-    PDF_LIBRARY = "pdfplumber"
+    import pypdfium2 as pdfium
+    PDF_LIBRARY = "pypdfium2"
 except ImportError:
     try:
-        from pypdf import PdfReader
-        PDF_LIBRARY = "pypdf"
+        import pdfplumber
+        PDF_LIBRARY = "pdfplumber"
     except ImportError:
-        PDF_LIBRARY = None
-        print("Warning: No PDF library found. Install pdfplumber or pypdf:")
-        print("  pip install pdfplumber")
-        print("  # or")
-        print("  pip install pypdf")
+        try:
+            from pypdf import PdfReader
+            PDF_LIBRARY = "pypdf"
+        except ImportError:
+            PDF_LIBRARY = None
+            print("Warning: No PDF library found. Install pypdfium2, pdfplumber or pypdf:")
+            print("  pip install pypdfium2")
+            print("  # or")
+            print("  pip install pdfplumber")
 
 
 def extract_text_from_pdf(pdf_path: str) -> str:
     """Extract text from a PDF file."""
-    if PDF_LIBRARY == "pdfplumber":
+    if PDF_LIBRARY == "pypdfium2":
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            text = "".join(page.get_textpage().get_text_range() for page in pdf)
+        finally:
+            pdf.close()
+        # PDFium ends lines with CRLF; the parsing regexes expect \n
+        return text.replace("\r\n", "\n")
+    elif PDF_LIBRARY == "pdfplumber":
         with pdfplumber.open(pdf_path) as pdf:
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-            return text
+            return "".join(page.extract_text() or "" for page in pdf.pages)
     elif PDF_LIBRARY == "pypdf":
         reader = PdfReader(pdf_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ""
-        return text
+        return "".join(page.extract_text() or "" for page in reader.pages)
     else:
         raise RuntimeError("No PDF library available")
 
 
+# Criteria with their max points - if we see the max points, it's a pass
+CRITERIA_CONFIG = [
+    ("false_content", ["false", "misleading content"], 22),
+    ("responsible_gathering", ["gathers", "presents information responsibly"], 18),
+    ("corrections", ["correcting errors", "effective practices"], 12.5),
+    ("news_opinion_separation", ["news and opinion", "opinion responsibly"], 12.5),
+    ("avoids_deceptive_headlines", ["deceptive headlines"], 10),
+    ("ownership_disclosure", ["ownership and financing", "discloses ownership"], 7.5),
+    ("labels_advertising", ["labels advertising", "clearly labels"], 7.5),
+    ("reveals_leadership", ["who's in charge", "conflicts of interest"], 5),
+    ("content_creator_info", ["content creators", "biographical information"], 5),
+]
+
+# Patterns are compiled once rather than per PDF
+_SCORE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*/\s*100')
+_POINTS_RE = re.compile(r'\d+(?:\.\d+)?')
+_OWNERSHIP_RE = re.compile(
+    r'Ownership and Financing\s*\n(.+?)(?:\nContent\n|\nCredibility\n)',
+    re.DOTALL | re.IGNORECASE
+)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# process_all_pdfs writes a partial output file after this many PDFs
+CHECKPOINT_EVERY = 100
+
+
 def parse_newsguard_text(text: str, domain: str) -> dict:
     """Parse NewsGuard label text into structured data."""
     result = {
@@ -68,7 +103,7 @@ def parse_newsguard_text(text: str, domain: str) -> dict:
     }
 
     # Extract score (e.g., "80 / 100" or "80/100")
-    score_match = re.search(r'(\d+(?:\.\d+)?)\s*/\s*100', text)
+    score_match = _SCORE_RE.search(text)
     if score_match:
         result["newsguard_score"] = float(score_match.group(1))
 
@@ -82,31 +117,19 @@ def parse_newsguard_text(text: str, domain: str) -> dict:
     elif "Low Credibility" in text:
         result["newsguard_rating"] = "Low Credibility"
 
-    # Define criteria with their max points - if we see the max points, it's a pass
-    criteria_config = [
-        ("false_content", ["false", "misleading content"], 22),
-        ("responsible_gathering", ["gathers", "presents information responsibly"], 18),
-        ("corrections", ["correcting errors", "effective practices"], 12.5),
-        ("news_opinion_separation", ["news and opinion", "opinion responsibly"], 12.5),
-        ("avoids_deceptive_headlines", ["deceptive headlines"], 10),
-        ("ownership_disclosure", ["ownership and financing", "discloses ownership"], 7.5),
-        ("labels_advertising", ["labels advertising", "clearly labels"], 7.5),
-        ("reveals_leadership", ["who's in charge", "conflicts of interest"], 5),
-        ("content_creator_info", ["content creators", "biographical information"], 5),
-    ]
-
     # Parse criteria from the text
     # The format is usually: "Criterion text 22 points" or "Criterion text 18"
-    for crit_key, keywords, max_points in criteria_config:
+    # Points are the first number after a keyword's first occurrence (case
+    # insensitive), found with a substring search rather than a .*? regex
+    lowered = text.lower()
+    for crit_key, keywords, max_points in CRITERIA_CONFIG:
         for keyword in keywords:
-            # Find lines containing this criterion's keywords
-            pattern = re.compile(
-                rf'({keyword}).*?(\d+(?:\.\d+)?)\s*(?:points?)?',
-                re.IGNORECASE | re.DOTALL
-            )
-            match = pattern.search(text)
+            start = lowered.find(keyword)
+            if start < 0:
+                continue
+            match = _POINTS_RE.search(lowered, start + len(keyword))
             if match:
-                points = float(match.group(2))
+                points = float(match.group())
                 result["criteria"][crit_key]["points"] = points
                 # If points equal max, it's a pass. Otherwise fail.
                 # (Some criteria have N/A which shows as 7.5 for advertising)
@@ -121,47 +144,44 @@ def parse_newsguard_text(text: str, domain: str) -> dict:
                 break
 
     # Extract description (first paragraph after domain name)
+    # (domain-specific, and each PDF has its own domain, so nothing to reuse)
     desc_match = re.search(rf'{re.escape(domain)}\s*\n(.+?)(?:\d+(?:\.\d+)?\s*/\s*100)', text, re.DOTALL | re.IGNORECASE)
     if desc_match:
         desc = desc_match.group(1).strip()
         # Clean up
-        desc = re.sub(r'\s+', ' ', desc)
+        desc = _WHITESPACE_RE.sub(' ', desc)
         if len(desc) > 30:  # Only keep if it looks like a real description
             result["description"] = desc[:500]  # Truncate if too long
 
     # Extract ownership summary - get first 2-3 paragraphs
-    ownership_match = re.search(r'Ownership and Financing\s*\n(.+?)(?:\nContent\n|\nCredibility\n)', text, re.DOTALL | re.IGNORECASE)
+    ownership_match = _OWNERSHIP_RE.search(text)
     if ownership_match:
         ownership = ownership_match.group(1).strip()
-        ownership = re.sub(r'\s+', ' ', ownership)
+        ownership = _WHITESPACE_RE.sub(' ', ownership)
         if len(ownership) > 20:
             result["ownership_summary"] = ownership[:1000]
 
     return result
 
 
-def process_all_pdfs(pdf_dir: str, output_file: str):
-    """Process all PDFs in directory and output JSON."""
-    pdf_dir = Path(pdf_dir)
-    results = []
-    errors = []
+def _process_one(pdf_path: Path) -> tuple[dict | None, dict | None]:
+    """Parse one PDF in a worker process; returns (result, error)."""
+    domain = pdf_path.stem  # filename without extension
+    try:
+        text = extract_text_from_pdf(str(pdf_path))
+        return parse_newsguard_text(text, domain), None
+    except Exception as e:
+        return None, {"domain": domain, "error": str(e)}
 
-    pdf_files = list(pdf_dir.glob("*.pdf"))
-    print(f"Found {len(pdf_files)} PDF files")
 
-    for pdf_path in sorted(pdf_files):
-        domain = pdf_path.stem  # filename without extension
-        print(f"Processing: {domain}")
+def _process_numbered(item: tuple[int, Path]) -> tuple[int, dict | None, dict | None]:
+    """_process_one for (index, path) pairs, so unordered results can be re-sorted."""
+    index, pdf_path = item
+    return (index, *_process_one(pdf_path))
 
-        try:
-            text = extract_text_from_pdf(str(pdf_path))
-            data = parse_newsguard_text(text, domain)
-            results.append(data)
-        except Exception as e:
-            print(f"  Error: {e}")
-            errors.append({"domain": domain, "error": str(e)})
 
-    # Save results
+def _write_output(output_file: str, results: list, errors: list):
+    """Write the extraction JSON (also used for partial checkpoints)."""
     output = {
         "metadata": {
             "source": "NewsGuard Nutrition Labels",
@@ -173,8 +193,47 @@ def process_all_pdfs(pdf_dir: str, output_file: str):
         "errors": errors
     }
 
-    with open(output_file, 'w') as f:
-        json.dump(output, f, indent=2)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+
+
+def process_all_pdfs(pdf_dir: str, output_file: str):
+    """Process all PDFs in directory and output JSON."""
+    pdf_dir = Path(pdf_dir)
+    checkpoint_file = f"{output_file}.partial"
+
+    pdf_files = sorted(pdf_dir.glob("*.pdf"))
+    print(f"Found {len(pdf_files)} PDF files")
+
+    # Text extraction is CPU-bound and each PDF is independent, so fan out
+    # across cores. Results are taken as they finish, so one slow PDF does
+    # not hold back the rest; a checkpoint with what is done so far is
+    # written every CHECKPOINT_EVERY files in case a long run dies.
+    # slots holds (data, error) per file index, so output stays in file order.
+    slots = [None] * len(pdf_files)
+    with multiprocessing.Pool() as pool:
+        for done, (index, data, error) in enumerate(
+            pool.imap_unordered(_process_numbered, enumerate(pdf_files), chunksize=4),
+            start=1
+        ):
+            print(f"[{done}/{len(pdf_files)}] {pdf_files[index].stem}")
+            if error:
+                print(f"  Error: {error['error']}")
+            slots[index] = (data, error)
+
+            if done % CHECKPOINT_EVERY == 0:
+                _write_output(
+                    checkpoint_file,
+                    [slot[0] for slot in slots if slot and slot[0]],
+                    [slot[1] for slot in slots if slot and slot[1]]
+                )
+
+    results = [data for data, _ in slots if data]
+    errors = [error for _, error in slots if error]
+
+    # Save results
+    _write_output(output_file, results, errors)
+    Path(checkpoint_file).unlink(missing_ok=True)
 
     print(f"\nSaved {len(results)} sources to {output_file}")
     if errors:
@@ -197,7 +256,7 @@ def test_single_pdf(pdf_path: str):
     data = parse_newsguard_text(text, domain)
 
     print("\nParsed data:")
-    print(json.dumps(data, indent=2))
+    print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
 
     return data
 
@@ -213,7 +272,8 @@ if __name__ == "__main__":
             # Default test file
             test_single_pdf("/home/mmariani/Projects/SourceInfo/scraper/pdfs/nytimes.com.pdf")
     else:
-        # Process all PDFs
+        # Process all PDFs; block-buffer the per-file progress lines
+        sys.stdout.reconfigure(line_buffering=False)
         process_all_pdfs(
             "/home/mmariani/Projects/SourceInfo/scraper/pdfs",
             "/home/mmariani/Projects/SourceInfo/data/newsguard_extracted.json"
@@ -4,57 +4,175 @@ Query utility for the SourceInfo database.
 Provides functions for looking up sources and finding counternarratives.
 """
 
+import atexit
 import sqlite3
-import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List, Dict
 
+import orjson
+
 
 DB_PATH = Path("/home/mmariani/Projects/SourceInfo/data/sources.db")
 
+# Room for every distinct statement below, so the shared connection's
+# statement cache never evicts one and each is only parsed once
+CACHED_STATEMENTS = 256
+
+# AllSides lean values on each side of center
+LEFT_LEANS = (-2, -1)
+RIGHT_LEANS = (1, 2)
+
+COUNTER_SQL = """
+    SELECT domain, name, newsguard_score, political_lean, political_lean_label
+    FROM sources
+    WHERE political_lean IN ({placeholders})
+      AND newsguard_score >= ?
+    ORDER BY newsguard_score DESC
+    LIMIT ?
+"""
+
+# sign(source lean) -> (counter leans, query). Center sources get both sides;
+# others get the opposite side. Listing the leans lets each be a range scan
+# on idx_sources_lean_score.
+COUNTER_QUERIES = {
+    side: (leans, COUNTER_SQL.format(placeholders=", ".join("?" * len(leans))))
+    for side, leans in (
+        (-1, RIGHT_LEANS),
+        (1, LEFT_LEANS),
+        (0, LEFT_LEANS + RIGHT_LEANS),
+    )
+}
+
+BY_LEAN_SQL = """
+    SELECT domain, name, newsguard_score, political_lean_label, source_type
+    FROM sources
+    WHERE political_lean = ?
+      AND (newsguard_score >= ? OR newsguard_score IS NULL)
+    ORDER BY newsguard_score DESC
+"""
+
+CREDIBLE_SQL = """
+    SELECT domain, name, newsguard_score, political_lean_label, source_type
+    FROM sources
+    WHERE newsguard_score >= ?
+    ORDER BY newsguard_score DESC
+"""
 
+
+@lru_cache(maxsize=1)
 def get_connection():
-    """Get database connection."""
-    return sqlite3.connect(DB_PATH)
+    """Get the shared database connection (opened on first use)."""
+    conn = sqlite3.connect(DB_PATH, cached_statements=CACHED_STATEMENTS)
+    conn.row_factory = sqlite3.Row
+    atexit.register(conn.close)
+    return conn
+
+
+def _candidate_domains(domain: str) -> List[str]:
+    """
+    Domains a host could be stored under, most specific first.
+
+    "m.wsj.com" gives ["m.wsj.com", "wsj.com"]; a leading "www." is dropped.
+    """
+    parts = domain.strip().lower().removeprefix("www.").split(".")
+    return [".".join(parts[i:]) for i in range(max(1, len(parts) - 1))]
+
+
+@lru_cache(maxsize=None)
+def _find_source_sql(columns: str, candidate_count: int) -> str:
+    """Build the lookup query once per (columns, candidate count) pair."""
+    return (
+        f"SELECT {columns} FROM sources WHERE domain IN ({', '.join('?' * candidate_count)}) "
+        "ORDER BY length(domain) DESC LIMIT 1"
+    )
 
 
-def lookup_source(domain: str) -> Optional[Dict]:
+def _find_source(
+    cursor: sqlite3.Cursor, domain: str, columns: str, column_params: tuple = ()
+) -> Optional[sqlite3.Row]:
     """
-    Look up a source by domain.
+    Fetch the most specific stored match for a domain (primary key lookups only).
+
+    column_params bind any ? placeholders in the columns expression.
+    """
+    candidates = _candidate_domains(domain)
+    cursor.execute(_find_source_sql(columns, len(candidates)), (*column_params, *candidates))
+    return cursor.fetchone()
+
+
+# Columns for callers that only show who a source is and where it leans
+SUMMARY_COLUMNS = "domain, name, newsguard_score, political_lean, political_lean_label, source_type"
+
+# Every column except the criteria blob
+DETAIL_COLUMNS = (
+    f"{SUMMARY_COLUMNS}, newsguard_rating, description, ownership_summary, created_at"
+)
+
+
+def lookup_source_summary(domain: str) -> Optional[Dict]:
+    """
+    Look up a source's name, lean and score by domain.
 
     Args:
         domain: The domain to look up (e.g., "nytimes.com")
 
     Returns:
-        Dict with source info or None if not found
+        Dict with the SUMMARY_COLUMNS fields or None if not found
     """
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    row = _find_source(get_connection().cursor(), domain, SUMMARY_COLUMNS)
+    return dict(row) if row else None
 
-    # Try exact match first
-    cursor.execute("SELECT * FROM sources WHERE domain = ?", (domain,))
-    row = cursor.fetchone()
 
-    # If not found, try fuzzy match
-    if not row:
-        cursor.execute(
-            "SELECT * FROM sources WHERE domain LIKE ?",
-            (f"%{domain}%",)
-        )
-        row = cursor.fetchone()
+def lookup_source_full(domain: str, *, include_criteria: bool = False) -> Optional[Dict]:
+    """
+    Look up a source by domain, including its description and ownership.
 
-    conn.close()
+    Args:
+        domain: The domain to look up (e.g., "nytimes.com")
+        include_criteria: Also fetch and decode the NewsGuard criteria JSON
+            into "criteria" (skipped by default; no CLI command displays it)
+
+    Returns:
+        Dict with source info or None if not found
+    """
+    columns = "*" if include_criteria else DETAIL_COLUMNS
+    row = _find_source(get_connection().cursor(), domain, columns)
 
     if row:
         result = dict(row)
-        if result.get("criteria_json"):
-            result["criteria"] = json.loads(result["criteria_json"])
+        if include_criteria and result.get("criteria_json"):
+            result["criteria"] = orjson.loads(result["criteria_json"])
             del result["criteria_json"]
         return result
     return None
 
 
+# Older name, kept for existing callers
+lookup_source = lookup_source_full
+
+
+def get_criterion_points(domain: str, crit_key: str) -> Optional[float]:
+    """
+    Get the points a source scored on one NewsGuard criterion.
+
+    The value is read with SQLite's json_extract, so the criteria JSON is
+    never decoded in Python.
+
+    Args:
+        domain: The domain to look up (e.g., "nytimes.com")
+        crit_key: Criterion key (e.g., "false_content")
+
+    Returns:
+        Points, or None if the source, its criteria or that criterion's
+        points are missing
+    """
+    row = _find_source(
+        get_connection().cursor(), domain, "json_extract(criteria_json, ?)", (f"$.{crit_key}.points",)
+    )
+    return row[0] if row else None
+
+
 def find_counternarratives(domain: str, min_credibility: int = 60, limit: int = 10) -> List[Dict]:
     """
     Find sources from the opposite political spectrum.
@@ -67,48 +185,19 @@ def find_counternarratives(domain: str, min_credibility: int = 60, limit: int =
     Returns:
         List of counternarrative sources
     """
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
 
     # First get the source's political lean
-    cursor.execute(
-        "SELECT political_lean FROM sources WHERE domain = ? OR domain LIKE ?",
-        (domain, f"%{domain}%")
-    )
-    row = cursor.fetchone()
+    row = _find_source(cursor, domain, "political_lean")
 
     if not row or row["political_lean"] is None:
-        conn.close()
         return []
 
     source_lean = row["political_lean"]
+    leans, sql = COUNTER_QUERIES[(source_lean > 0) - (source_lean < 0)]
+    cursor.execute(sql, (*leans, min_credibility, limit))
 
-    if source_lean == 0:
-        # Center sources - return both left and right
-        cursor.execute("""
-            SELECT domain, name, newsguard_score, political_lean, political_lean_label
-            FROM sources
-            WHERE political_lean != 0
-              AND newsguard_score >= ?
-            ORDER BY newsguard_score DESC
-            LIMIT ?
-        """, (min_credibility, limit))
-    else:
-        # Find opposite side
-        cursor.execute("""
-            SELECT domain, name, newsguard_score, political_lean, political_lean_label
-            FROM sources
-            WHERE political_lean IS NOT NULL
-              AND political_lean * ? < 0
-              AND newsguard_score >= ?
-            ORDER BY newsguard_score DESC
-            LIMIT ?
-        """, (source_lean, min_credibility, limit))
-
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    return [dict(row) for row in cursor.fetchall()]
 
 
 def get_sources_by_lean(lean: int, min_credibility: int = 0) -> List[Dict]:
@@ -122,44 +211,25 @@ def get_sources_by_lean(lean: int, min_credibility: int = 0) -> List[Dict]:
     Returns:
         List of sources
     """
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
 
-    cursor.execute("""
-        SELECT domain, name, newsguard_score, political_lean_label, source_type
-        FROM sources
-        WHERE political_lean = ?
-          AND (newsguard_score >= ? OR newsguard_score IS NULL)
-        ORDER BY newsguard_score DESC
-    """, (lean, min_credibility))
+    cursor.execute(BY_LEAN_SQL, (lean, min_credibility))
 
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    return [dict(row) for row in cursor.fetchall()]
 
 
 def get_credible_sources(min_score: int = 80) -> List[Dict]:
     """Get all sources above a credibility threshold."""
-    conn = get_connection()
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
 
-    cursor.execute("""
-        SELECT domain, name, newsguard_score, political_lean_label, source_type
-        FROM sources
-        WHERE newsguard_score >= ?
-        ORDER BY newsguard_score DESC
-    """, (min_score,))
+    cursor.execute(CREDIBLE_SQL, (min_score,))
 
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    return [dict(row) for row in cursor.fetchall()]
 
 
 def source_summary(domain: str) -> str:
     """Get a human-readable summary of a source."""
-    source = lookup_source(domain)
+    source = lookup_source_full(domain)
     if not source:
         return f"Source not found: {domain}"
 
@@ -206,7 +276,7 @@ if __name__ == "__main__":
 
     elif cmd == "counter" and len(sys.argv) >= 3:
         domain = sys.argv[2]
-        source = lookup_source(domain)
+        source = lookup_source_summary(domain)
         if source:
             print(f"Counternarratives for {source.get('name', domain)} ({source.get('political_lean_label', 'Unknown')}):\n")
         counters = find_counternarratives(domain)
@@ -39,9 +39,9 @@ def test_database():
     # Test lookup
     source = lookup_source("nytimes.com")
     if source:
-        print(f"  ✓ Found: {source['name']}")
-        print(f"    Lean: {source['political_lean_label']}")
-        print(f"    Credibility: {source['newsguard_score']}/100")
+        print(f"  ✓ Found: {source.name}")
+        print(f"    Lean: {source.political_lean_label}")
+        print(f"    Credibility: {source.newsguard_score}/100")
     else:
         print("  ✗ NYT not found")
 
@@ -49,7 +49,7 @@ def test_database():
     counters = find_counternarratives("nytimes.com", min_credibility=70, limit=3)
     print(f"\n  Counternarratives for NYT: {len(counters)}")
     for c in counters[:3]:
-        print(f"    - {c['name']} ({c['political_lean_label']}, {c['newsguard_score']}/100)")
+        print(f"    - {c.name} ({c.political_lean_label}, {c.newsguard_score}/100)")
 
     # Test stats
     stats = get_database_stats()
@@ -61,10 +61,40 @@ def test_database():
     print("✓ Database queries working\n")
 
 
+def test_subdomain_sources():
+    """Test that sources stored under a subdomain resolve from article URLs."""
+    from fastapi.testclient import TestClient
+    from api.main import app
+
+    print("=" * 60)
+    print("TEST 3: Subdomain Sources")
+    print("=" * 60)
+
+    urls = [
+        "https://abcnews.go.com/Politics/story",
+        "https://news.yahoo.com/some-article.html",
+        "https://factcheck.afp.com/doc.afp.com.123",
+    ]
+
+    with TestClient(app) as client:
+        for url in urls:
+            result = client.post("/api/analyze", json={"url": url}).json()
+            print(f"  {url}")
+            print(f"    → {result['source']['domain'] if result['source_found'] else 'not found'}")
+            assert result["source_found"], url
+
+        batch = client.post("/api/analyze/batch", json={"urls": urls}).json()
+        assert all(result["source_found"] for result in batch["results"])
+
+        assert client.get("/api/sources/%5Bfoo").status_code == 404
+
+    print("✓ Subdomain sources resolved\n")
+
+
 def test_scoring():
     """Test weighted scoring."""
     print("=" * 60)
-    print("TEST 3: Weighted Scoring")
+    print("TEST 4: Weighted Scoring")
     print("=" * 60)
 
     source = lookup_source("nytimes.com")
@@ -74,9 +104,9 @@ def test_scoring():
 
     # Test neutral evidence scoring
     weighted, breakdown = calculate_weighted_score(
-        base_credibility=source.get("newsguard_score"),
-        source_type=source.get("source_type"),
-        political_lean=source.get("political_lean"),
+        base_credibility=source.newsguard_score,
+        source_type=source.source_type,
+        political_lean=source.political_lean,
         claim_type="political",
         evidence_role="neutral"
     )
@@ -90,9 +120,9 @@ def test_scoring():
 
     # Test counternarrative scoring
     weighted2, breakdown2 = calculate_weighted_score(
-        base_credibility=source.get("newsguard_score"),
-        source_type=source.get("source_type"),
-        political_lean=source.get("political_lean"),
+        base_credibility=source.newsguard_score,
+        source_type=source.source_type,
+        political_lean=source.political_lean,
         claim_type="political",
         evidence_role="counternarrative"
     )
@@ -103,6 +133,160 @@ def test_scoring():
     print("✓ Weighted scoring working\n")
 
 
+def test_background_jobs():
+    """Test that unfinished jobs survive eviction and a full queue is refused."""
+    import asyncio
+    from cachetools import TTLCache
+    from fastapi.testclient import TestClient
+    from api import jobs
+    from api.main import app
+
+    print("=" * 60)
+    print("TEST 5: Background Jobs")
+    print("=" * 60)
+
+    finished, max_pending = jobs._finished, jobs.MAX_PENDING_JOBS
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def slow():
+            await gate.wait()
+            return "done"
+
+        # One worker slot: the first job runs, the second waits its turn
+        jobs._slots = asyncio.Semaphore(1)
+        running, queued = jobs.submit(slow), jobs.submit(slow)
+        await asyncio.sleep(0)
+        print(f"  Submitted: {running.status}, {queued.status}")
+        assert (running.status, queued.status) == ("running", "queued")
+
+        # Overflow the finished cache; unfinished jobs must still be pollable
+        for i in range(5):
+            jobs._finished[f"old{i}"] = jobs.Job(id=f"old{i}", status="completed")
+        assert jobs.get(running.id) is running
+        assert jobs.get(queued.id) is queued
+
+        jobs.MAX_PENDING_JOBS = 2
+        assert jobs.submit(slow) is None
+        print("  Submit with a full queue → refused")
+
+        gate.set()
+        while jobs._tasks:
+            await asyncio.sleep(0)
+        assert jobs.get(running.id).status == jobs.get(queued.id).status == "completed"
+        await jobs.shutdown()
+
+    try:
+        jobs._finished = TTLCache(2, jobs.JOB_TTL)
+        asyncio.run(run())
+
+        jobs.MAX_PENDING_JOBS = 0
+        with TestClient(app) as client:
+            response = client.post(
+                "/api/content/analyze/jobs",
+                json={"url": "https://www.nytimes.com/2024/article"}
+            )
+        print(f"  POST with a full queue → {response.status_code}")
+        assert response.status_code == 503
+    finally:
+        jobs._finished, jobs.MAX_PENDING_JOBS = finished, max_pending
+
+    print("✓ Background jobs working\n")
+
+
+def test_rate_limiting():
+    """Test Retry-After parsing, backoff and retries on limit-exceeded responses."""
+    import asyncio
+    import time
+    import httpx
+    from api.content_fetcher import fetch_article_content
+    from api.rate_limit import MAX_BACKOFF, TokenBucket, backoff_delay, retry_after_seconds
+
+    print("=" * 60)
+    print("TEST 6: Rate Limiting")
+    print("=" * 60)
+
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "7"})) == 7.0
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "soon"})) is None
+    assert retry_after_seconds(httpx.Response(429)) is None
+    assert backoff_delay(0, retry_after=7.0) == 7.0
+    assert backoff_delay(0, retry_after=600.0) == MAX_BACKOFF
+    assert 1 <= backoff_delay(0) < 2
+    assert backoff_delay(20) == MAX_BACKOFF
+    print("  ✓ Retry-After and backoff")
+
+    async def paced():
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+        await bucket.acquire()
+        await bucket.acquire()
+        bucket.pause(0.1)
+        await bucket.acquire()
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(paced())
+    print(f"  Token bucket: 3 acquisitions in {elapsed:.2f}s")
+    assert elapsed >= 0.1
+
+    async def fetch(statuses):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            status = statuses[min(len(calls), len(statuses)) - 1]
+            if status == 200:
+                return httpx.Response(200, text="Article text. " * 50)
+            return httpx.Response(status, headers={"Retry-After": "0"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            article = await fetch_article_content("https://example.com/a", client)
+        return article, len(calls)
+
+    article, calls = asyncio.run(fetch([429, 503, 200]))
+    print(f"  429, 503, 200 → success={article.success} after {calls} requests")
+    assert article.success and calls == 3
+
+    article, calls = asyncio.run(fetch([429]))
+    print(f"  Persistent 429 → {article.error} after {calls} requests")
+    assert not article.success and calls == 5
+
+    article, calls = asyncio.run(fetch([404]))
+    assert not article.success and calls == 1
+
+    print("✓ Rate limiting working\n")
+
+
+def test_etag():
+    """Test conditional GETs on cacheable endpoints."""
+    from fastapi.testclient import TestClient
+    from api.main import app
+
+    print("=" * 60)
+    print("TEST 7: ETag Revalidation")
+    print("=" * 60)
+
+    with TestClient(app) as client:
+        for path in ["/api/sources/nytimes.com", "/api/sources/stats/overview"]:
+            response = client.get(path)
+            etag = response.headers["etag"]
+            assert response.status_code == 200
+
+            cached = client.get(path, headers={"If-None-Match": etag})
+            print(f"  {path}: ETag {etag} → {cached.status_code}")
+            assert cached.status_code == 304
+            assert cached.content == b""
+            assert cached.headers["etag"] == etag
+
+            weak = client.get(path, headers={"If-None-Match": f"W/{etag}"})
+            assert weak.status_code == 304
+
+            stale = client.get(path, headers={"If-None-Match": '"stale"'})
+            assert stale.status_code == 200
+
+    print("✓ ETag revalidation working\n")
+
+
 if __name__ == "__main__":
     print("\n" + "=" * 60)
     print("SourceInfo API - Component Tests")
@@ -111,7 +295,11 @@ if __name__ == "__main__":
     try:
         test_url_parser()
         test_database()
+        test_subdomain_sources()
         test_scoring()
+        test_background_jobs()
+        test_rate_limiting()
+        test_etag()
 
         print("=" * 60)
         print("ALL TESTS PASSED ✓")